@@ -100,17 +100,12 @@ class TVarFigure1D(object):
     def _setxrange(self):
         #Check if x range is not set, if not, set good ones
         if 'x_range' not in pytplot.tplot_opt_glob:
-            datasets = []
+            datasets = [dataset.times for dataset in pytplot.data_quants.base_tvars(self.tvar_name)]
             x_min_list = []
             x_max_list = []
-            if isinstance(pytplot.data_quants[self.tvar_name].data, list):
-                for oplot_name in pytplot.data_quants[self.tvar_name].data:
-                    datasets.append(pytplot.data_quants[oplot_name].data)
-            else:
-                datasets.append(pytplot.data_quants[self.tvar_name].data)
             for dataset in datasets:
-                x_min_list.append(np.nanmin(dataset.index.tolist()))
-                x_max_list.append(np.nanmax(dataset.index.tolist()))
+                x_min_list.append(np.nanmin(dataset))
+                x_max_list.append(np.nanmax(dataset))
             pytplot.tplot_opt_glob['x_range'] = [np.nanmin(x_min_list), np.nanmax(x_max_list)]
             tplot_x_range = [np.nanmin(x_min_list), np.nanmax(x_max_list)]
             if self.show_xaxis:
@@ -159,12 +154,7 @@ class TVarFigure1D(object):
     def _visdata(self):
         self._setcolors()
         
-        datasets = []
-        if isinstance(pytplot.data_quants[self.tvar_name].data, list):
-            for oplot_name in pytplot.data_quants[self.tvar_name].data:
-                datasets.append(pytplot.data_quants[oplot_name])
-        else:
-            datasets.append(pytplot.data_quants[self.tvar_name])
+        datasets = pytplot.data_quants.base_tvars(self.tvar_name)
         
         
         for dataset in datasets:                
@@ -175,18 +165,18 @@ class TVarFigure1D(object):
                 
             #Get a list of formatted times  
             corrected_time = [] 
-            for x in dataset.data.index:
+            for x in dataset.times:
                 corrected_time.append(tplot_utilities.int_to_str(x))
                 
             #Bokeh uses milliseconds since epoch for some reason
-            x = dataset.data.index * 1000
+            x = dataset.times * 1000
             
-            #Create lines from each column in the dataframe    
-            for column_name in dataset.data.columns:
-                y = dataset.data[column_name]
+            #Create lines from each column in the data
+            for column in range(dataset.values.shape[1]):
+                y = dataset.values[:,column]
                 
                 if self._getyaxistype() == 'log':
-                    y.loc[y <= 0] = np.NaN                
+                    y = np.where(y > 0, y, np.NaN)
                 
                 line_source = ColumnDataSource(data=dict(x=x, y=y, corrected_time=corrected_time))
                 if self.auto_color:
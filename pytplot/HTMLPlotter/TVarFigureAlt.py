@@ -83,14 +83,9 @@ class TVarFigureAlt(object):
     def _setxrange(self):
         #Check if x range is not set, if not, set good ones
         if 'alt_range' not in pytplot.tplot_opt_glob:
-            datasets = []
+            datasets = pytplot.data_quants.base_tvars(self.tvar_name)
             x_min_list = []
             x_max_list = []
-            if isinstance(pytplot.data_quants[self.tvar_name].data, list):
-                for oplot_name in pytplot.data_quants[self.tvar_name].data:
-                    datasets.append(pytplot.data_quants[oplot_name])
-            else:
-                datasets.append(pytplot.data_quants[self.tvar_name])
             for dataset in datasets:
                 _, alt = pytplot.get_data(dataset.links['alt'])
                 x_min_list.append(np.nanmin(alt.tolist()))
@@ -124,17 +119,10 @@ class TVarFigureAlt(object):
                                  line_color = time_bar['line_color'], 
                                  line_width = time_bar['line_width'])
             self.fig.renderers.extend([time_bar_line])
-        #initialize dataset variable
-        datasets = []
         #grab tbardict
         tbardict = pytplot.data_quants[self.tvar_name].time_bar
         ltbar = len(tbardict)
-        #make sure data is in list format
-        if isinstance(pytplot.data_quants[self.tvar_name].data, list):
-            for oplot_name in pytplot.data_quants[self.tvar_name].data:
-                datasets.append(pytplot.data_quants[oplot_name])
-        else:
-            datasets.append(pytplot.data_quants[self.tvar_name])        
+        datasets = pytplot.data_quants.base_tvars(self.tvar_name)
         for dataset in datasets:  
             #for location in tbar dict
             for i in range(ltbar):
@@ -146,8 +134,8 @@ class TVarFigureAlt(object):
                 #correlate given time with corresponding data/alt points
                 time, altitude = pytplot.get_data(dataset.links['alt']) 
                 altitude = altitude.transpose()[0]
-                nearest_time_index = np.abs(time - test_time).argmin()
-                data_point = dataset.data.iloc[nearest_time_index][0]
+                nearest_time_index = pytplot.data_quants[dataset.links['alt']].nearest_index(test_time)
+                data_point = dataset.values[nearest_time_index,0]
                 alt_point = altitude[nearest_time_index]
                 #color = pytplot.tplot_utilities.rgb_color(color)
                 self.fig.circle([alt_point], [data_point], size = pointsize, color = color)
@@ -173,12 +161,7 @@ class TVarFigureAlt(object):
     def _visdata(self):
         self._setcolors()
         
-        datasets = []
-        if isinstance(pytplot.data_quants[self.tvar_name].data, list):
-            for oplot_name in pytplot.data_quants[self.tvar_name].data:
-                datasets.append(pytplot.data_quants[oplot_name])
-        else:
-            datasets.append(pytplot.data_quants[self.tvar_name])
+        datasets = pytplot.data_quants.base_tvars(self.tvar_name)
         
         for dataset in datasets:                
             #Get Linestyle
@@ -188,13 +171,13 @@ class TVarFigureAlt(object):
                 
             _, x = pytplot.get_data(dataset.links['alt'])
             
-            #Create lines from each column in the dataframe    
-            for column_name in dataset.data.columns:
-                y = dataset.data[column_name]
+            #Create lines from each column in the data
+            for column in range(dataset.values.shape[1]):
+                y = dataset.values[:,column]
                 
                 
                 if self._getyaxistype() == 'log':
-                    y.loc[y <= 0] = np.NaN
+                    y = np.where(y > 0, y, np.NaN)
                                  
                 
                 line_source = ColumnDataSource(data=dict(x=x, y=y))
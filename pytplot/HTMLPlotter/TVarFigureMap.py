@@ -4,7 +4,6 @@
 # Verify current version before use at: https://github.com/MAVENSDC/PyTplot
 
 from __future__ import division
-import numpy as np
 import os
 from bokeh.plotting.figure import Figure
 from bokeh.models import (LogColorMapper, LogTicker, LinearColorMapper, 
@@ -119,21 +118,14 @@ class TVarFigureMap(object):
             self.zmin = pytplot.data_quants[self.tvar_name].zaxis_opt['z_range'][0]
             self.zmax = pytplot.data_quants[self.tvar_name].zaxis_opt['z_range'][1]
         else:
-            if isinstance(pytplot.data_quants[self.tvar_name].data, list):
-                #Check the first one
-                dataset_temp = pytplot.data_quants[pytplot.data_quants[self.tvar_name].data[0]].data.replace([np.inf, -np.inf], np.nan)
-            else:
-                dataset_temp = pytplot.data_quants[self.tvar_name].data.replace([np.inf, -np.inf], np.nan)
-            self.zmax = dataset_temp.max().max()
-            self.zmin = dataset_temp.min().min()
+            #Check the first one
+            stats = pytplot.data_quants.base_tvars(self.tvar_name)[0].stats
+            self.zmax = stats.max
+            self.zmin = stats.min
             
             #Cannot have a 0 minimum in a log scale
             if self.zscale=='log':
-                zmin_list = []
-                for column in dataset_temp.columns:
-                    series = dataset_temp[column]
-                    zmin_list.append(series.iloc[series.nonzero()[0]].min())
-                self.zmin = min(zmin_list)
+                self.zmin = stats.min_positive
         
     def _setminborder(self):
         self.fig.min_border_bottom = pytplot.tplot_opt_glob['min_border_bottom']
@@ -146,17 +138,10 @@ class TVarFigureMap(object):
                                  line_color = time_bar['line_color'], 
                                  line_width = time_bar['line_width'])
             self.fig.renderers.extend([time_bar_line])
-        #initialize dataset variable
-        datasets = []
         #grab tbardict
         tbardict = pytplot.data_quants[self.tvar_name].time_bar
         ltbar = len(tbardict)
-        #make sure data is in list format
-        if isinstance(pytplot.data_quants[self.tvar_name].data, list):
-            for oplot_name in pytplot.data_quants[self.tvar_name].data:
-                datasets.append(pytplot.data_quants[oplot_name])
-        else:
-            datasets.append(pytplot.data_quants[self.tvar_name])        
+        datasets = pytplot.data_quants.base_tvars(self.tvar_name)
         for dataset in datasets:  
             #for location in tbar dict
             for i in range(ltbar):
@@ -169,7 +154,7 @@ class TVarFigureMap(object):
                 time, longitude = pytplot.get_data(dataset.links['lon'])
                 latitude = latitude.transpose()[0]
                 longitude = longitude.transpose()[0]
-                nearest_time_index = np.abs(time - test_time).argmin()
+                nearest_time_index = pytplot.data_quants[dataset.links['lat']].nearest_index(test_time)
                 lat_point = latitude[nearest_time_index]
                 lon_point = longitude[nearest_time_index]
                 #color = pytplot.tplot_utilities.rgb_color(color)
@@ -206,20 +191,15 @@ class TVarFigureMap(object):
         
     def _visdata(self):
         self._setcolors()
-        datasets = []
-        if isinstance(pytplot.data_quants[self.tvar_name].data, list):
-            for oplot_name in pytplot.data_quants[self.tvar_name].data:
-                datasets.append(pytplot.data_quants[oplot_name])
-        else:
-            datasets.append(pytplot.data_quants[self.tvar_name])
+        datasets = pytplot.data_quants.base_tvars(self.tvar_name)
         
         cm_index=0
         for dataset in datasets:   
             #TODO: Add a check that lon and lat are only 1D
             _, x = pytplot.get_data(dataset.links['lon'])
             _, y = pytplot.get_data(dataset.links['lat'])
-            for column_name in dataset.data.columns:
-                values = dataset.data[column_name].tolist()
+            for column in range(dataset.values.shape[1]):
+                values = dataset.values[:,column].tolist()
                 colors=[]
                 colors.extend(pytplot.tplot_utilities.get_heatmap_color(color_map=self.colors[cm_index % len(self.colors)], 
                                                                         min_val=self.zmin, 
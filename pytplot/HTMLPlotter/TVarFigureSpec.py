@@ -5,7 +5,6 @@
 
 from __future__ import division
 import numpy as np
-import pandas as pd
 import math
 from bokeh.plotting.figure import Figure
 from bokeh.models import (CustomJS, LogColorMapper, LogTicker, LinearColorMapper, 
@@ -116,8 +115,8 @@ class TVarFigureSpec(object):
     def _setxrange(self):
         #Check if x range is not set, if not, set good ones
         if 'x_range' not in pytplot.tplot_opt_glob:
-            pytplot.tplot_opt_glob['x_range'] = [np.nanmin(pytplot.data_quants[self.tvar_name].data.index.tolist()), np.nanmax(pytplot.data_quants[self.tvar_name].data.index.tolist())]
-            tplot_x_range = Range1d(np.nanmin(pytplot.data_quants[self.tvar_name].data.index.tolist()), np.nanmax(pytplot.data_quants[self.tvar_name].data.index.tolist()))
+            pytplot.tplot_opt_glob['x_range'] = [np.nanmin(pytplot.data_quants[self.tvar_name].times), np.nanmax(pytplot.data_quants[self.tvar_name].times)]
+            tplot_x_range = Range1d(np.nanmin(pytplot.data_quants[self.tvar_name].times), np.nanmax(pytplot.data_quants[self.tvar_name].times))
             if self.show_xaxis:
                 pytplot.lim_info['xfull'] = tplot_x_range
                 pytplot.lim_info['xlast'] = tplot_x_range
@@ -139,17 +138,13 @@ class TVarFigureSpec(object):
             self.zmin = pytplot.data_quants[self.tvar_name].zaxis_opt['z_range'][0]
             self.zmax = pytplot.data_quants[self.tvar_name].zaxis_opt['z_range'][1]
         else:
-            dataset_temp = pytplot.data_quants[self.tvar_name].data.replace([np.inf, -np.inf], np.nan)
-            self.zmax = dataset_temp.max().max()
-            self.zmin = dataset_temp.min().min()
+            stats = pytplot.data_quants[self.tvar_name].stats
+            self.zmax = stats.max
+            self.zmin = stats.min
             
             #Cannot have a 0 minimum in a log scale
             if self.zscale=='log':
-                zmin_list = []
-                for column in pytplot.data_quants[self.tvar_name].data.columns:
-                    series = pytplot.data_quants[self.tvar_name].data[column]
-                    zmin_list.append(series.iloc[series.nonzero()[0]].min())
-                self.zmin = min(zmin_list)
+                self.zmin = stats.min_positive
         
     def _setminborder(self):
         self.fig.min_border_bottom = pytplot.tplot_opt_glob['min_border_bottom']
@@ -196,16 +191,18 @@ class TVarFigureSpec(object):
     def _visdata(self):
         self._setcolors()
         
-        x = pytplot.data_quants[self.tvar_name].data.index.tolist()
-        temp = [a for a in x if (a <= (pytplot.tplot_opt_glob['x_range'][1]) and a >= (pytplot.tplot_opt_glob['x_range'][0]))]
-        x= temp
+        times = pytplot.data_quants[self.tvar_name].times
+        values = pytplot.data_quants[self.tvar_name].values
+        first, last = pytplot.data_quants[self.tvar_name].time_indices(pytplot.tplot_opt_glob['x_range'][0], pytplot.tplot_opt_glob['x_range'][1])
+        x_indices = np.arange(first, last)
     
         #Sometimes X will be huge, we'll need to cut down so that each x will stay about 1 pixel in size
         step_size=1
-        num_rect_displayed = len(x)
+        num_rect_displayed = len(x_indices)
         if (self.fig.plot_width) < num_rect_displayed:
             step_size=int(math.floor(num_rect_displayed/(self.fig.plot_width)))
-            x[:] = x[0::step_size]
+            x_indices = x_indices[0::step_size]
+        x = times[x_indices]
         
         
         #Determine bin sizes
@@ -214,12 +211,12 @@ class TVarFigureSpec(object):
             bins_vary = pytplot.data_quants[self.tvar_name].spec_bins_time_varying
             bins_increasing = pytplot.data_quants[self.tvar_name].spec_bins_ascending
         else:
-            bins = pd.DataFrame(np.arange(len(pytplot.data_quants[self.tvar_name].data.columns))).transpose()
+            bins = np.arange(values.shape[1])[np.newaxis, :]
             bins_vary = False
             bins_increasing = True
         #Get length of arrays
         size_x = len(x)
-        size_y = len(bins.columns)
+        size_y = bins.shape[1]
         
         #These arrays will be populated with data for the rectangle glyphs
         color = []
@@ -242,9 +239,9 @@ class TVarFigureSpec(object):
         
         #Handle the case of time-varying bin sizes
         if bins_vary:
-            temp_bins = bins.loc[x[0:size_x-1]]
+            temp_bins = bins[x_indices[0:size_x-1]]
         else:
-            temp_bins = bins.loc[0]
+            temp_bins = bins[0]
 
         if bins_increasing:
             bin_index_range = range(0,size_y-1,1)
@@ -253,7 +250,7 @@ class TVarFigureSpec(object):
         
         
         for i in bin_index_range:
-            temp = pytplot.data_quants[self.tvar_name].data[i][x[0:size_x-1]].tolist()
+            temp = values[x_indices[0:size_x-1], i].tolist()
             value.extend(temp)
             color.extend(tplot_utilities.get_heatmap_color(color_map=self.colors[0], 
                                                            min_val=self.zmin, 
@@ -263,11 +260,11 @@ class TVarFigureSpec(object):
             
             #Handle the case of time-varying bin sizes
             if bins_vary:
-                bottom.extend(temp_bins[i].tolist())
+                bottom.extend(temp_bins[:,i].tolist())
                 if bins_increasing:
-                    top.extend(temp_bins[i+1].tolist())
+                    top.extend(temp_bins[:,i+1].tolist())
                 else:
-                    top.extend(temp_bins[i-1].tolist())
+                    top.extend(temp_bins[:,i-1].tolist())
             else:
                 bottom.extend([temp_bins[i]]*(size_x-1))
                 if bins_increasing:
@@ -296,7 +293,7 @@ class TVarFigureSpec(object):
                                            y_range = (self.zmin, self.zmax), 
                                            y_axis_type=y_interactive_log)
             self.interactive_plot.min_border_left = 100
-            spec_bins = bins
+            spec_bins = bins[0]
             flux = [0]*len(spec_bins)
             interactive_line_source = ColumnDataSource(data=dict(x=spec_bins, y=flux))
             interactive_line = Line(x='x', y='y')
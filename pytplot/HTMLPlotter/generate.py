@@ -88,8 +88,8 @@ def generate_stack(name,
         for new_x_axis in var_label:
             
             axis_data_quant = pytplot.data_quants[new_x_axis]
-            axis_start = min(axis_data_quant.data.min(skipna=True).tolist())
-            axis_end = max(axis_data_quant.data.max(skipna=True).tolist())
+            axis_start = axis_data_quant.stats.min
+            axis_end = axis_data_quant.stats.max
             x_axes.append(Range1d(start = axis_start, end = axis_end))
             k = 0
             while(k < num_plots ):
@@ -5,7 +5,7 @@ class NonLinearAxis(pg.AxisItem):
     def __init__(self, orientation, pen=None, linkView=None, parent=None, maxTickLength=-5, showValues=True, data=None):
         pg.AxisItem.__init__(self, orientation=orientation, pen=pen, linkView=linkView, parent=parent, maxTickLength=maxTickLength, showValues=showValues)
         self.data = data
-        self.f = interpolate.interp1d(data.data.index.tolist(), data.data[0].tolist())
+        self.f = interpolate.interp1d(data.times, data.values[:,0])
         self.num_ticks = 4
     
     def tickStrings(self, values, scale, spacing):
@@ -6,18 +6,21 @@ from pyqtgraph.Point import Point
 from pyqtgraph import debug as debug
 import collections
 from pytplot import tplot_opt_glob
+from pytplot.tplot_utilities import float_dtype
 
 class UpdatingImage(pg.ImageItem):
     
     _MAX_IMAGE_WIDTH = 10000
     _MAX_IMAGE_HEIGHT = 200
     
-    def __init__(self, data, spec_bins, ascending_descending, ytype, ztype, lut, zmin, zmax):
+    def __init__(self, times, data, spec_bins, ascending_descending, ytype, ztype, lut, zmin, zmax):
         pg.ImageItem.__init__(self)
         
         if ztype=='log':
-            data[data <= 0] = np.NaN
-            self.data = np.log10(data)
+            #Done in the precision of the data, so float32 data isn't doubled in size
+            dtype = float_dtype(data)
+            data = np.where(data > 0, data, dtype.type(np.NaN))
+            self.data = np.log10(data, dtype=dtype)
             self.zmin = np.log10(zmin)
             self.zmax = np.log10(zmax)
         else:
@@ -29,11 +32,11 @@ class UpdatingImage(pg.ImageItem):
         self.bins_inc = ascending_descending
         self.w = 100
         self.h = 100
-        self.x = self.data.index.tolist()
+        self.x = times
         if ytype=='log':
-            self.y = np.log10(self.bin_sizes.iloc[0])
+            self.y = np.log10(self.bin_sizes[0])
         else:
-            self.y = self.bin_sizes.iloc[0]
+            self.y = self.bin_sizes[0]
         self.picturenotgened=True
         self.generatePicture()
         
@@ -42,8 +45,8 @@ class UpdatingImage(pg.ImageItem):
         
         xmin = np.nanmin(self.x)
         xmax = np.nanmax(self.x)
-        ymin = self.y.min().min()
-        ymax= self.y.max().max()
+        ymin = np.nanmin(self.y)
+        ymax= np.nanmax(self.y)
         if pixel_size is None:
             width_in_pixels = tplot_opt_glob['window_size'][0]
             height_in_pixels = tplot_opt_glob['window_size'][1]
@@ -73,12 +76,12 @@ class UpdatingImage(pg.ImageItem):
             yp = np.linspace(ymin, ymax, self.h)
 
             closest_xs = np.searchsorted(self.x, xp)
-            y_sort = np.argsort(self.y.values)
+            y_sort = np.argsort(self.y)
             #if len(self.bin_sizes) == 1:
-            closest_ys = np.searchsorted(self.y.values, yp, sorter=y_sort)
+            closest_ys = np.searchsorted(self.y, yp, sorter=y_sort)
             if not self.bins_inc:
                 closest_ys = np.flipud(closest_ys)
-            data = self.data.iloc[closest_xs][closest_ys].values
+            data = self.data[np.ix_(closest_xs, closest_ys)]
             #else:
             #    for j in range(0,self.w):
             #        closest_ys = np.searchsorted(self.y.iloc[closest_xs[j]], yp, sorter=y_sort)
@@ -101,17 +101,12 @@ class TVarFigure1D(pg.GraphicsLayout):
         return self
     
     def _visdata(self):
-        datasets = []
-        if isinstance(pytplot.data_quants[self.tvar_name].data, list):
-            for oplot_name in pytplot.data_quants[self.tvar_name].data:
-                datasets.append(pytplot.data_quants[oplot_name])
-        else:
-            datasets.append(pytplot.data_quants[self.tvar_name])
+        datasets = pytplot.data_quants.base_tvars(self.tvar_name)
         line_num = 0
         for dataset in datasets: 
-            for i in range(0,len(dataset.data.columns)):
-                self.curves.append(self.plotwindow.plot(dataset.data.index.tolist(), 
-                                                        dataset.data[i].tolist(), 
+            for i in range(0,dataset.values.shape[1]):
+                self.curves.append(self.plotwindow.plot(dataset.times, 
+                                                        dataset.values[:,i], 
                                                         pen=self.colors[line_num % len(self.colors)]))
                 line_num+=1
 
@@ -198,17 +198,10 @@ class TVarFigureAlt(pg.GraphicsLayout):
         return
     
     def _addtimebars(self):
-        #initialize dataset variable
-        datasets = []
         #grab tbardict
         tbardict = pytplot.data_quants[self.tvar_name].time_bar
         ltbar = len(tbardict)
-        #make sure data is in list format
-        if isinstance(pytplot.data_quants[self.tvar_name].data, list):
-            for oplot_name in pytplot.data_quants[self.tvar_name].data:
-                datasets.append(pytplot.data_quants[oplot_name])
-        else:
-            datasets.append(pytplot.data_quants[self.tvar_name])        
+        datasets = pytplot.data_quants.base_tvars(self.tvar_name)
         for dataset in datasets:  
             #for location in tbar dict
             for i in range(ltbar):
@@ -220,25 +213,20 @@ class TVarFigureAlt(pg.GraphicsLayout):
                 #correlate given time with corresponding data/alt points
                 time, altitude = pytplot.get_data(dataset.links['alt']) 
                 altitude = altitude.transpose()[0]
-                nearest_time_index = np.abs(time - test_time).argmin()
-                data_point = dataset.data.iloc[nearest_time_index][0]
+                nearest_time_index = pytplot.data_quants[dataset.links['alt']].nearest_index(test_time)
+                data_point = dataset.values[nearest_time_index,0]
                 alt_point = altitude[nearest_time_index]
                 #color = pytplot.tplot_utilities.rgb_color(color)
                 self.plotwindow.scatterPlot([alt_point], [data_point], size = pointsize, pen=pg.mkPen(None), brush=color)
         return
     
     def _visdata(self):
-        datasets = []
-        if isinstance(pytplot.data_quants[self.tvar_name].data, list):
-            for oplot_name in pytplot.data_quants[self.tvar_name].data:
-                datasets.append(pytplot.data_quants[oplot_name])
-        else:
-            datasets.append(pytplot.data_quants[self.tvar_name])
+        datasets = pytplot.data_quants.base_tvars(self.tvar_name)
         line_num = 0
         for dataset in datasets:  
-            for i in range(0,len(dataset.data.columns)):
+            for i in range(0,dataset.values.shape[1]):
                 _, x = pytplot.get_data(dataset.links['alt']) 
                 x = x.transpose()[0]
-                self.curves.append(self.plotwindow.scatterPlot(x.tolist(), dataset.data[i].tolist(), 
+                self.curves.append(self.plotwindow.scatterPlot(x, dataset.values[:,i], 
                                                         pen=pg.mkPen(None), brush=self.colors[line_num % len(self.colors)]))
                 line_num+=1
\ No newline at end of file
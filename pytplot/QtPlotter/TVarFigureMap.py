@@ -111,12 +111,7 @@ class TVarFigureMap(pg.GraphicsLayout):
         return self
     
     def _visdata(self):    
-        datasets = []
-        if isinstance(pytplot.data_quants[self.tvar_name].data, list):
-            for oplot_name in pytplot.data_quants[self.tvar_name].data:
-                datasets.append(pytplot.data_quants[oplot_name])
-        else:
-            datasets.append(pytplot.data_quants[self.tvar_name])
+        datasets = pytplot.data_quants.base_tvars(self.tvar_name)
         
         cm_index=0
         for dataset in datasets: 
@@ -124,8 +119,8 @@ class TVarFigureMap(pg.GraphicsLayout):
             lat = lat.transpose()[0]
             _, lon = pytplot.get_data(dataset.links['lon']) 
             lon = lon.transpose()[0]    
-            for column_name in dataset.data.columns:
-                values = dataset.data[column_name].tolist()
+            for column in range(dataset.values.shape[1]):
+                values = dataset.values[:,column].tolist()
                 colors = pytplot.tplot_utilities.get_heatmap_color(color_map=self.colormap[cm_index % len(self.colormap)], 
                                                                         min_val=self.zmin, 
                                                                         max_val=self.zmax, 
@@ -195,12 +190,7 @@ class TVarFigureMap(pg.GraphicsLayout):
             index_x = round(float(mousePoint.x()),2)
             index_y = round(float(mousePoint.y()),2)
             #get latitude and longitude arrays
-            datasets = []
-            if isinstance(pytplot.data_quants[self.tvar_name].data, list):
-                for oplot_name in pytplot.data_quants[self.tvar_name].data:
-                    datasets.append(pytplot.data_quants[oplot_name])
-            else:
-                datasets.append(pytplot.data_quants[self.tvar_name])
+            datasets = pytplot.data_quants.base_tvars(self.tvar_name)
             
             time, latitude = pytplot.get_data(datasets[0].links['lat']) 
             latitude = latitude.transpose()[0]
@@ -279,34 +269,20 @@ class TVarFigureMap(pg.GraphicsLayout):
             self.zmin = pytplot.data_quants[self.tvar_name].zaxis_opt['z_range'][0]
             self.zmax = pytplot.data_quants[self.tvar_name].zaxis_opt['z_range'][1]
         else:
-            if isinstance(pytplot.data_quants[self.tvar_name].data, list):
-                #Check the first one
-                dataset_temp = pytplot.data_quants[pytplot.data_quants[self.tvar_name].data[0]].data.replace([np.inf, -np.inf], np.nan)
-            else:
-                dataset_temp = pytplot.data_quants[self.tvar_name].data.replace([np.inf, -np.inf], np.nan)
-            self.zmax = dataset_temp.max().max()
-            self.zmin = dataset_temp.min().min()
+            #Check the first one
+            stats = pytplot.data_quants.base_tvars(self.tvar_name)[0].stats
+            self.zmax = stats.max
+            self.zmin = stats.min
             
             #Cannot have a 0 minimum in a log scale
             if self.zscale=='log':
-                zmin_list = []
-                for column in pytplot.data_quants[self.tvar_name].data.columns:
-                    series = pytplot.data_quants[self.tvar_name].data[column]
-                    zmin_list.append(series.iloc[series.nonzero()[0]].min())
-                self.zmin = min(zmin_list)
+                self.zmin = stats.min_positive
     
     def _addtimebars(self):
-        #initialize dataset variable
-        datasets = []
         #grab tbardict
         tbardict = pytplot.data_quants[self.tvar_name].time_bar
         ltbar = len(tbardict)
-        #make sure data is in list format
-        if isinstance(pytplot.data_quants[self.tvar_name].data, list):
-            for oplot_name in pytplot.data_quants[self.tvar_name].data:
-                datasets.append(pytplot.data_quants[oplot_name])
-        else:
-            datasets.append(pytplot.data_quants[self.tvar_name])        
+        datasets = pytplot.data_quants.base_tvars(self.tvar_name)
         for dataset in datasets:  
             #for location in tbar dict
             for i in range(ltbar):
@@ -319,7 +295,7 @@ class TVarFigureMap(pg.GraphicsLayout):
                 time, longitude = pytplot.get_data(dataset.links['lon'])
                 latitude = latitude.transpose()[0]
                 longitude = longitude.transpose()[0]
-                nearest_time_index = np.abs(time - test_time).argmin()
+                nearest_time_index = pytplot.data_quants[dataset.links['lat']].nearest_index(test_time)
                 lat_point = latitude[nearest_time_index]
                 lon_point = longitude[nearest_time_index]
                 #color = pytplot.tplot_utilities.rgb_color(color)
@@ -101,8 +101,8 @@ class TVarFigureSpec(pg.GraphicsLayout):
         return self
     
     def _visdata(self):
-        self._setzrange()
-        specplot = UpdatingImage(pytplot.data_quants[self.tvar_name].data, 
+        specplot = UpdatingImage(pytplot.data_quants[self.tvar_name].times, 
+                                 pytplot.data_quants[self.tvar_name].values, 
                                  pytplot.data_quants[self.tvar_name].spec_bins, 
                                  pytplot.data_quants[self.tvar_name].spec_bins_ascending, 
                                  self._getyaxistype(), 
@@ -176,21 +176,19 @@ class TVarFigureSpec(pg.GraphicsLayout):
             else:
                 index_y = round(float(mousePoint.y()),4)
 
-            dataframe = pytplot.data_quants[self.tvar_name].data
+            values = pytplot.data_quants[self.tvar_name].values
             specframe = pytplot.data_quants[self.tvar_name].spec_bins
             
             #find closest time/data to cursor location
-            x = np.asarray(dataframe.index.tolist())            
-            x_sub = abs(x-index_x*np.ones(len(x)))
+            x = pytplot.data_quants[self.tvar_name].times
+            x_sub = abs(x-index_x)
             x_argmin = np.argmin(x_sub)
             x_closest = x[x_argmin]
-            speclength = len(specframe.loc[0])
-            y = np.asarray((specframe.loc[0,0:speclength-1]))
-            y_sub = abs(y-index_y*np.ones(y.size))
+            y = specframe[0]
+            y_sub = abs(y-index_y)
             y_argmin = np.argmin(y_sub)
             y_closest = y[y_argmin]
-            index = int((np.nonzero(y == y_closest))[0])
-            dp = dataframe[index][x_closest]
+            dp = values[x_argmin, y_argmin]
             #add crosshairs
             if self._mouseMovedFunction != None:
                 self._mouseMovedFunction(int(mousePoint.x()))
@@ -267,17 +265,13 @@ class TVarFigureSpec(pg.GraphicsLayout):
             self.zmin = pytplot.data_quants[self.tvar_name].zaxis_opt['z_range'][0]
             self.zmax = pytplot.data_quants[self.tvar_name].zaxis_opt['z_range'][1]
         else:
-            dataset_temp = pytplot.data_quants[self.tvar_name].data.replace([np.inf, -np.inf], np.nan)
-            self.zmax = dataset_temp.max().max()
-            self.zmin = dataset_temp.min().min()
+            stats = pytplot.data_quants[self.tvar_name].stats
+            self.zmax = stats.max
+            self.zmin = stats.min
             
             #Cannot have a 0 minimum in a log scale
             if self.zscale=='log':
-                zmin_list = []
-                for column in pytplot.data_quants[self.tvar_name].data.columns:
-                    series = pytplot.data_quants[self.tvar_name].data[column]
-                    zmin_list.append(series.iloc[series.nonzero()[0]].min())
-                self.zmin = min(zmin_list)
+                self.zmin = stats.min_positive
     
     def _addtimebars(self):
         #find number of times to plot
@@ -3,8 +3,18 @@
 # This software was developed at the University of Colorado's Laboratory for Atmospheric and Space Physics.
 # Verify current version before use at: https://github.com/MAVENSDC/PyTplot
 
+import itertools
+import threading
+import warnings
 import numpy as np
-from _collections import OrderedDict
+import pandas as pd
+from .tvar_stats import TVarStats
+from .memory_budget import use_counter
+from .tvar_buffer import TVarBuffer
+from .tvar_registry import TVarRegistry
+
+#Every change to the data of a TVar takes the next number, see TVar.data_version
+data_version_counter = itertools.count(1)
 
 
 #If we are in an ipython environment, set the gui to be qt5
@@ -72,18 +82,68 @@ class TVar(object):
     """ 
     The basic data object in pytplot.  Each dataset is its own separate TVar object.  
     This exists to encapsulate the data and details about how to plot the data.  
+    
+    The data itself is stored in columns, as a 1D numpy array of times and a 2D numpy 
+    array of values (times x columns).  A pandas DataFrame is only built if the 
+    "data" attribute is requested.  Data with more than 2 dimensions is also 
+    kept whole in nd_values, see reduce().  
     """
     
     def __init__(self, name, number, data, spec_bins, yaxis_opt, zaxis_opt, line_opt,
-                 trange, dtype, create_time, time_bar, extras, links):
+                 trange, dtype, create_time, time_bar, extras, links, loader=None, precision=None):
         
         #Name of the TVar
         self.name = name
         #TVar number
         self.number = number
-        #The data of the TVar
+        #Function that returns the data of a lazy TVar, see load()
+        self._loader = None
+        #True while the loader is running
+        self._loading = False
+        #Held while the data is loaded or made again, so that other threads 
+        #wait for it instead of seeing it half done
+        self._lock = threading.RLock()
+        #The float type ('float32' or 'float64') the values and spec_bins are 
+        #kept in, or None to keep the type they were given in
+        self.precision = precision
+        #When the data was last used, for the memory budget
+        self._last_used = next(use_counter)
+        #Changes every time the data changes, see data_version
+        self._version = next(data_version_counter)
+        #For TVars made by tplot_math, the function that makes the data again
+        #and the data_version of each input when it was last run, see refresh()
+        self.recipe = None
+        self.input_versions = None
+        #The TVar stored under each input name when the recipe was set
+        self._input_numbers = None
+        #Preallocated arrays for data that is appended to, see append()
+        self._buffer = None
+        #If set, only this many of the newest samples are kept
+        self.max_samples = None
+        #If set, only the samples this many seconds older than the newest are kept
+        self.max_seconds = None
+        #The times of the TVar, a 1D numpy array
+        self._times = None
+        #Whether the times are in increasing order, None if not checked yet
+        self._times_sorted = None
+        #The values of the TVar, a 2D numpy array (times x columns)
+        self._values = None
+        self._stats = None
+        #The full array of data with more than 2 dimensions (times x ...), and 
+        #the bins of each dimension after time (None where there aren't any)
+        self._nd_values = None
+        self.nd_axes = None
+        #Results of reduce(), and the data_version they were made from
+        self._reductions = {}
+        self._reductions_version = None
+        #List of the TVars this one overlays, if it is a combination of other TVars
+        self.overlay = None
+        #The data of the TVar.  Setting this fills in times/values or overlay.
         self.data = data
-        #The spec_bins, if applicable
+        #The spec_bins, if applicable.  A 2D numpy array, with 1 row if the bins
+        #are constant in time, or 1 row per time if they vary.
+        self._spec_bins = None
+        self._spec_bins_stats = None
         self.spec_bins = spec_bins
         #Dictionary of the y axis options
         self.yaxis_opt = yaxis_opt
@@ -92,7 +152,7 @@ class TVar(object):
         #Dictionary of line options
         self.line_opt = line_opt
         #The time range
-        self.trange = trange
+        self._trange = trange
         #The data type of the data (ex - int/double)
         self.dtype = dtype
         #String of creation time of this object
@@ -105,85 +165,745 @@ class TVar(object):
         self.links = links
         #Whether or not the spec_bins vary in time
         self.spec_bins_time_varying = False
+        #Whether each row of the spec_bins is strictly in order, a 1D bool array
+        self.spec_bins_monotonic = None
         #Whether the spec_bins are ascending or decending order
         self.spec_bins_ascending = self._check_spec_bins_ordering()
+        #Nothing is read until the data is first used
+        self._loader = loader
+    
+    @property
+    def data(self):
+        '''
+        The data of the TVar.  For TVars that combine other TVars, this is the 
+        list of names being overlaid.  Otherwise, a pandas DataFrame is built 
+        from the time and value arrays each time this is accessed.  
+        '''
+        if self.overlay is not None:
+            return self.overlay
+        if self.values is None:
+            return None
+        return pd.DataFrame(self.values, index=pd.Index(self.times, name='Index'))
+    
+    @data.setter
+    def data(self, data):
+        if isinstance(data, list):
+            self.overlay = data
+            self.times = None
+            self.values = None
+        elif isinstance(data, pd.DataFrame):
+            self.overlay = None
+            self.times = np.asarray(data.index.values)
+            self.values = np.asarray(data.values)
+        elif data is not None:
+            self.overlay = None
+            self.times, self.values = data
+    
+    @property
+    def times(self):
+        '''The times of the TVar, a 1D numpy array'''
+        self._use()
+        return self._times
+    
+    @times.setter
+    def times(self, times):
+        self._times = times
+        self._version = next(data_version_counter)
+        self._times_sorted = None
+        self._buffer = None
+    
+    @property
+    def values(self):
+        '''The values of the TVar, a 2D numpy array (times x columns)'''
+        self._use()
+        return self._values
+    
+    @values.setter
+    def values(self, values):
+        self._values = values
+        self._version = next(data_version_counter)
+        self._stats = None
+        self._buffer = None
+    
+    @property
+    def nd_values(self):
+        '''The full array of data with more than 2 dimensions, or None'''
+        self._use()
+        return self._nd_values
+    
+    @nd_values.setter
+    def nd_values(self, nd_values):
+        self._nd_values = nd_values
+        self._reductions = {}
+        self._version = next(data_version_counter)
+    
+    def reduce(self, method='sum', axis=1, index=None):
+        '''
+        Removes one dimension of the data, and returns the result (the times 
+        are still the first dimension).  This works on nd_values, or the 2D 
+        values if there aren't any.  Each result is kept until the data 
+        changes, so asking for the same reduction again doesn't recompute it.  
+        
+        Parameters:
+            method : str
+                "sum" or "mean" along the dimension (NaNs are ignored), or 
+                "slice" to take the data at one index of the dimension.  
+            axis : int
+                The dimension to remove.  1 is the first dimension after time.  
+            index : int or [int, int]
+                For "slice", the index to take.  For "sum" and "mean", the first 
+                and last (inclusive) indices to use, instead of the whole dimension.  
+        
+        Returns:
+            A numpy array, or None if the reduction is not valid.  
+        '''
+        data = self.nd_values
+        if data is None:
+            data = self.values
+        if data is None:
+            return
+        if not 1 <= axis < data.ndim:
+            print("axis must be between 1 and " + str(data.ndim-1) + ".")
+            return
+        if isinstance(index, list):
+            index = tuple(index)
+        reductions = self._current_reductions()
+        key = (method, axis, index)
+        if key not in reductions:
+            reduced = self._compute_reduction(data, method, axis, index)
+            if reduced is None:
+                return
+            reductions[key] = reduced
+        return reductions[key]
+    
+    def _current_reductions(self):
+        #The cache of results made from the data, emptied when the data changes
+        if self._reductions_version != self._version:
+            self._reductions = {}
+            self._reductions_version = self._version
+        return self._reductions
+    
+    def window_mean(self, start, end):
+        '''
+        Returns the mean of each column of the values with times between start 
+        and end (inclusive).  Values that aren't finite are ignored.  start and 
+        end can also be arrays, to get the means of many windows at once (one 
+        row per window).  
+        
+        The first time this is used, running totals of the values and of the 
+        number of finite values are made and kept until the data changes.  After 
+        that, the mean of any window only takes a subtraction, however many 
+        samples are in it.  
+        '''
+        self.sort_times()
+        first = np.searchsorted(self.times, start, side='left')
+        last = np.searchsorted(self.times, end, side='right')
+        return self._index_window_mean(first, last)
+    
+    def _index_window_mean(self, first, last):
+        #Mean of each column of values[first:last], first and last can be arrays.  
+        #A window that ends before it starts is empty, so its mean is NaN.
+        sums, counts = self._prefix_sums()
+        last = np.maximum(last, first)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (sums[last] - sums[first])/(counts[last] - counts[first])
+    
+    def _prefix_sums(self):
+        #Running totals of the finite values and the number of them in each 
+        #column, with a row of zeros first so that the totals of values[i:j] 
+        #are row j minus row i.  Totals are kept in float64, so that adding up 
+        #many float32 values doesn't lose precision.
+        values = self.values
+        reductions = self._current_reductions()
+        if ('prefix', 'sum') not in reductions:
+            finite = np.isfinite(values)
+            sums = np.zeros((len(values)+1,) + values.shape[1:])
+            np.cumsum(np.where(finite, values, 0), axis=0, dtype=np.float64, out=sums[1:])
+            counts = np.zeros((len(values)+1,) + values.shape[1:], dtype=np.int64)
+            np.cumsum(finite, axis=0, out=counts[1:])
+            reductions[('prefix', 'sum')] = sums
+            reductions[('prefix', 'count')] = counts
+        return reductions[('prefix', 'sum')], reductions[('prefix', 'count')]
+    
+    @staticmethod
+    def _compute_reduction(data, method, axis, index):
+        if method == 'slice':
+            if not isinstance(index, (int, np.integer)):
+                print('A slice needs the index to take.')
+                return
+            return np.take(data, index, axis=axis)
+        if method not in ['sum', 'mean']:
+            print('method must be "sum", "mean" or "slice".')
+            return
+        if index is not None:
+            data = np.take(data, np.arange(index[0], index[1]+1), axis=axis)
+        with warnings.catch_warnings():
+            #All NaN rows give NaN means without a warning
+            warnings.simplefilter('ignore', RuntimeWarning)
+            if method == 'sum':
+                return np.nansum(data, axis=axis)
+            return np.nanmean(data, axis=axis)
+    
+    @property
+    def spec_bins(self):
+        '''The spec_bins of the TVar, a 2D numpy array'''
+        self._use()
+        return self._spec_bins
+    
+    @spec_bins.setter
+    def spec_bins(self, spec_bins):
+        self._spec_bins = spec_bins
+        self._version = next(data_version_counter)
+        self._spec_bins_stats = None
+        self._buffer = None
+    
+    @property
+    def trange(self):
+        '''The time range of the TVar'''
+        self._use()
+        return self._trange
+    
+    @trange.setter
+    def trange(self, trange):
+        self._trange = trange
+    
+    @property
+    def stats(self):
+        '''
+        Summary statistics (min/max/min_positive) of the values.  These are 
+        computed the first time they are needed and kept until the values are 
+        replaced.  If the values array is changed in place, call invalidate_stats().
+        '''
+        if self._stats is None:
+            self._stats = TVarStats(self.values)
+        return self._stats
+    
+    @property
+    def spec_bins_stats(self):
+        '''Summary statistics of the spec_bins, see stats'''
+        if self._spec_bins_stats is None:
+            self._spec_bins_stats = TVarStats(self.spec_bins)
+        return self._spec_bins_stats
+    
+    def invalidate_stats(self):
+        '''
+        Forces the statistics to be recomputed the next time they are used.  
+        This also counts as a change to the data (see data_version).  
+        '''
+        self._stats = None
+        self._spec_bins_stats = None
+        self._version = next(data_version_counter)
+    
+    @property
+    def data_version(self):
+        '''
+        A number that changes every time the data of the TVar changes.  Numbers 
+        are never reused, so a TVar stored under the same name again always 
+        has a different version.  
+        '''
+        self._use()
+        return self._version
+    
+    def _use(self):
+        #Reads in lazy data or makes stale derived data again before it is used
+        if self._loader is not None or self._loading:
+            self.load()
+        if self.recipe is not None:
+            self.refresh()
+        self._last_used = next(use_counter)
+    
+    @property
+    def is_lazy(self):
+        '''True if the data of the TVar has not been read in yet'''
+        return self._loader is not None
+    
+    def load(self):
+        '''
+        Reads in the data of a lazy TVar (see register_lazy).  This happens 
+        automatically the first time the data is used, so it rarely needs to 
+        be called directly.  Does nothing if the data is already in memory.  
+        '''
+        if self._loader is None and not self._loading:
+            return
+        with self._lock:
+            #Another thread may have loaded it while this one waited
+            if self._loader is None:
+                return
+            self._loading = True
+            try:
+                self._load()
+            finally:
+                self._loading = False
+        from .memory_budget import enforce_memory_budget
+        enforce_memory_budget()
+    
+    def _load(self):
+        from .store_data import get_y_range
+        loader = self._loader
+        #Cleared first, so the properties below don't try to load again
+        self._loader = None
+        data = loader()
+        if data is None:
+            print("No data could be loaded for " + self.name)
+            return
+        if not self._set_data(data):
+            return
+        if 'y_range' not in self.yaxis_opt:
+            self.yaxis_opt['y_range'] = get_y_range(self)
+    
+    def set_recipe(self, recipe, inputs):
+        '''
+        Makes this a derived TVar, whose data is made from the data of other 
+        tplot variables.  This is how the tplot_math functions store their 
+        results.  
+        
+        Parameters:
+            recipe : function
+                A function that takes no arguments, and returns the data in the 
+                same format as the "data" parameter of store_data.  
+            inputs : list of str
+                The names of the tplot variables the recipe reads.  The current 
+                data_version of each is kept, so the recipe is only run again 
+                once one of them changes.  
+        
+        No recipe is set if any of the inputs are missing, or are made from 
+        this TVar (directly or through other derived TVars).  If an input is 
+        renamed later, the recipe is dropped and the data is left as it is.  
+        '''
+        self.clear_recipe()
+        if self.name in self._all_inputs(inputs):
+            #The inputs are made from this TVar, so the recipe would use its 
+            #own result
+            return
+        versions = self._current_input_versions(inputs)
+        if versions is None:
+            return
+        self._input_numbers = {name: data_quants.number(name) for name in inputs}
+        self.input_versions = versions
+        self.recipe = recipe
+    
+    def clear_recipe(self):
+        '''Stops this TVar being made again from its inputs, see set_recipe'''
+        self.recipe = None
+        self.input_versions = None
+        self._input_numbers = None
+    
+    @staticmethod
+    def _all_inputs(inputs):
+        #The names of the inputs, the inputs of any that are derived TVars, 
+        #and so on
+        found = set()
+        names = list(inputs)
+        while names:
+            name = names.pop()
+            if name in found:
+                continue
+            found.add(name)
+            tvar = data_quants.get(name)
+            if tvar is not None and tvar.recipe is not None and tvar.input_versions is not None:
+                names.extend(tvar.input_versions)
+        return found
+    
+    def _inputs_renamed(self):
+        #If an input has been renamed, its name may now belong to an unrelated 
+        #TVar, so the recipe is dropped.  Returns True if it was.  The inputs 
+        #are followed by their number in data_quants rather than by keeping 
+        #the TVars, so inputs that are stored again or deleted can be freed.  
+        if self._input_numbers is None:
+            return False
+        for name, number in list(self._input_numbers.items()):
+            current_name = data_quants.name_of(number)
+            if current_name is None:
+                #Deleted, a variable stored with its name since is used instead
+                self._input_numbers[name] = data_quants.number(name)
+            elif current_name != name:
+                self.clear_recipe()
+                return True
+        return False
+    
+    @property
+    def is_stale(self):
+        '''True if this is a derived TVar and any of its inputs have changed'''
+        if self.recipe is None or self._inputs_renamed():
+            return False
+        versions = self._current_input_versions(self.input_versions)
+        return versions is not None and versions != self.input_versions
+    
+    def refresh(self):
+        '''
+        Runs the recipe of a derived TVar again (see set_recipe) if any of its 
+        inputs have changed since it was last run.  Inputs that are derived 
+        TVars themselves are brought up to date first.  This happens 
+        automatically whenever the data is used, so it rarely needs to be 
+        called directly.  If an input has been deleted, the data is left as it is.  
+        '''
+        if self.recipe is None:
+            return
+        with self._lock:
+            if not self._refresh():
+                return
+        from .memory_budget import enforce_memory_budget
+        enforce_memory_budget()
+    
+    def _refresh(self):
+        #Runs the recipe if it needs to be, returns True if it was run
+        if self.recipe is None or self._inputs_renamed():
+            return False
+        versions = self._current_input_versions(self.input_versions)
+        if versions is None or versions == self.input_versions:
+            return False
+        from .store_data import get_y_range
+        #Set first, so that using the data below doesn't run the recipe again
+        self.input_versions = versions
+        automatic_y_range = self.yaxis_opt.get('y_range') == get_y_range(self)
+        data = self.recipe()
+        if data is None or not self._set_data(data):
+            return False
+        if automatic_y_range or 'y_range' not in self.yaxis_opt:
+            self.yaxis_opt['y_range'] = get_y_range(self)
+        return True
+    
+    @staticmethod
+    def _current_input_versions(inputs):
+        #Name -> data_version of each input, or None if any are missing
+        if inputs is None:
+            return None
+        versions = {}
+        for name in inputs:
+            if name not in data_quants or data_quants[name].overlay is not None:
+                return None
+            versions[name] = data_quants[name].data_version
+        return versions
+    
+    def _set_data(self, data):
+        #Replaces the data with a dictionary like the "data" of store_data.  
+        #The arrays are not copied.  Returns False if the data is not valid.
+        from .store_data import format_data
+        formatted_data = format_data(data, copy=False, precision=self.precision)
+        if formatted_data is None:
+            return False
+        self.times, self.values, self.spec_bins, self.nd_values, self.nd_axes = formatted_data
+        self._times_sorted = True
+        self.trange = [np.nanmin(self.times), np.nanmax(self.times)]
+        self.spec_bins_time_varying = False
+        self.spec_bins_ascending = self._check_spec_bins_ordering()
+        return True
+    
+    @property
+    def times_sorted(self):
+        '''True if the times are in increasing order.  store_data always sorts them.'''
+        if self._times_sorted is None:
+            times = self.times
+            self._times_sorted = times is None or bool(np.all(times[1:] >= times[:-1]))
+        return self._times_sorted
+    
+    def sort_times(self):
+        '''
+        Puts the samples in time order, if they aren't already.  This only has 
+        to be done if the times were set directly instead of through store_data.
+        '''
+        if self.times_sorted:
+            return
+        order = np.argsort(self.times, kind='stable')
+        time_varying = self.spec_bins_time_varying
+        self.times, self.values = self.times[order], self.values[order]
+        if time_varying:
+            self.spec_bins = self.spec_bins[order]
+        if self.nd_values is not None:
+            self.nd_values = self.nd_values[order]
+            #Axes with a row for each time (2D) vary in time
+            if self.nd_axes is not None:
+                self.nd_axes = [axis[order] if axis is not None and axis.ndim == 2 else axis 
+                                for axis in self.nd_axes]
+        self._times_sorted = True
+    
+    def time_indices(self, start, end):
+        '''
+        Returns the first and last+1 indices of the samples with times between 
+        start and end (inclusive), found by binary search.  The samples between 
+        them are times[first:last], which is a view and not a copy.  
+        '''
+        self.sort_times()
+        return (int(np.searchsorted(self.times, start, side='left')), 
+                int(np.searchsorted(self.times, end, side='right')))
+    
+    def time_slice(self, start, end):
+        '''
+        Returns the times and values of the samples with times between start 
+        and end (inclusive).  They are views of the stored arrays, found with 
+        time_indices, so nothing is copied.  
+        '''
+        first, last = self.time_indices(start, end)
+        return self.times[first:last], self.values[first:last]
+    
+    def nearest_index(self, time):
+        '''Returns the index of the sample closest to the given time'''
+        self.sort_times()
+        times = self.times
+        index = int(np.searchsorted(times, time))
+        if index == len(times):
+            return len(times) - 1
+        if index > 0 and time - times[index-1] <= times[index] - time:
+            return index - 1
+        return index
+    
+    def append(self, times, values, spec_bins=None):
+        '''
+        Adds samples to the end of the TVar, see append_data.  The arrays are 
+        kept in a TVarBuffer, so this takes time proportional to the number of 
+        new samples, not the total.  The time range, statistics and y range 
+        are updated from the new samples only.  
+        
+        If max_samples or max_seconds are set, the oldest samples are then 
+        dropped so that only the newest are kept.  
+        '''
+        from .store_data import get_y_range
+        #A y range that was set by the user is left alone
+        automatic_y_range = self.yaxis_opt.get('y_range') == get_y_range(self)
+        #Data added by hand would be lost if a derived TVar was made again
+        self.clear_recipe()
+        self._version = next(data_version_counter)
+        
+        if self.is_ring_buffer:
+            #The new samples that would be dropped right away are never added
+            keep = self._samples_to_keep(times)
+            times = times[keep:]
+            values = values[keep:]
+            if spec_bins is not None:
+                spec_bins = spec_bins[keep:]
+        if self._buffer is None:
+            self._make_buffer()
+        if self.is_ring_buffer:
+            self._drop(self._samples_to_drop(times))
+        
+        if len(times) != 0 and self._times_sorted:
+            #Stays sorted if the new times are in order and come after the old ones
+            self._times_sorted = bool(np.all(times[1:] >= times[:-1]) and 
+                                      (len(self._times) == 0 or times[0] >= self._times[-1]))
+        self._buffer.extend(times, values, spec_bins)
+        self._times = self._buffer.times
+        self._values = self._buffer.values
+        if self.spec_bins_time_varying:
+            self._spec_bins = self._buffer.spec_bins
+            if self._spec_bins_stats is not None:
+                self._spec_bins_stats.update(spec_bins)
+        if self._stats is not None:
+            self._stats.update(values)
+        
+        if self.is_ring_buffer:
+            if len(self._times) != 0 and self._times_sorted:
+                self._trange = [self._times[0], self._times[-1]]
+            elif len(self._times) != 0:
+                self._trange = [np.nanmin(self._times), np.nanmax(self._times)]
+        elif len(times) != 0:
+            self._trange = [min(self._trange[0], np.nanmin(times)), 
+                            max(self._trange[1], np.nanmax(times))]
+        if automatic_y_range:
+            self.yaxis_opt['y_range'] = get_y_range(self)
+    
+    @property
+    def is_ring_buffer(self):
+        '''True if only the newest samples are kept, see max_samples and max_seconds'''
+        return self.max_samples is not None or self.max_seconds is not None
+    
+    def _make_buffer(self):
+        capacity = None
+        if self.max_samples is not None:
+            #Room for twice the samples kept, so the samples are only moved 
+            #back to the start of the arrays once every max_samples appends
+            capacity = 2*self.max_samples
+        if self.spec_bins_time_varying:
+            self._buffer = TVarBuffer(self.times, self.values, self.spec_bins, capacity=capacity)
+        else:
+            self._buffer = TVarBuffer(self.times, self.values, capacity=capacity)
+    
+    def _samples_to_keep(self, times):
+        #Index of the first of the new samples that will be kept
+        first = 0
+        if self.max_samples is not None:
+            first = max(first, len(times) - self.max_samples)
+        if self.max_seconds is not None and len(times) != 0:
+            newest = np.nanmax(times)
+            if self._times is not None and len(self._times) != 0:
+                newest = max(newest, self._times[-1])
+            first = max(first, np.searchsorted(times, newest - self.max_seconds))
+        return first
+    
+    def _samples_to_drop(self, new_times):
+        #Number of the oldest samples that have to go to make room for new_times
+        count = 0
+        if self.max_samples is not None:
+            count = max(count, len(self._times) + len(new_times) - self.max_samples)
+        if self.max_seconds is not None and len(self._times) != 0:
+            newest = self._times[-1]
+            if len(new_times) != 0:
+                newest = max(newest, np.nanmax(new_times))
+            count = max(count, np.searchsorted(self._times, newest - self.max_seconds))
+        return count
+    
+    def _drop(self, count):
+        #Removes the oldest samples from the buffer and the statistics
+        if count <= 0:
+            return
+        if self._stats is not None and not self._stats.remove(self._values[:count]):
+            self._stats = None
+        if self.spec_bins_time_varying and self._spec_bins_stats is not None:
+            if not self._spec_bins_stats.remove(self._spec_bins[:count]):
+                self._spec_bins_stats = None
+        self._buffer.drop(count)
+        self._times = self._buffer.times
+        self._values = self._buffer.values
+        if self.spec_bins_time_varying:
+            self._spec_bins = self._buffer.spec_bins
+    
+    def __setstate__(self, state):
+        #TVars pickled before the columnar storage kept a DataFrame in "data"
+        old_data = state.pop('data', None)
+        old_times = state.pop('times', None)
+        old_values = state.pop('values', None)
+        old_spec_bins = state.pop('spec_bins', None)
+        old_trange = state.pop('trange', None)
+        self.__dict__.update(state)
+        #Everything the properties use is set up first, since older pickles 
+        #don't have all of it
+        self._loader = None
+        self._loading = False
+        self._lock = threading.RLock()
+        self.recipe = None
+        self.input_versions = None
+        self._input_numbers = None
+        self._buffer = None
+        self._stats = None
+        self._spec_bins_stats = None
+        self._reductions = {}
+        self._reductions_version = None
+        self._last_used = next(use_counter)
+        self._version = next(data_version_counter)
+        if '_times_sorted' not in state:
+            self._times_sorted = None
+        if 'precision' not in state:
+            self.precision = None
+        if '_nd_values' not in state:
+            self._nd_values = None
+            self.nd_axes = None
+        if 'overlay' not in state:
+            self.overlay = None
+        if 'max_samples' not in state:
+            self.max_samples = None
+            self.max_seconds = None
+        if 'spec_bins_monotonic' not in state:
+            self.spec_bins_monotonic = None
+        if '_times' not in state:
+            self._times = old_times
+        if '_values' not in state:
+            self._values = old_values
+        if '_spec_bins' not in state:
+            self._spec_bins = old_spec_bins
+        if '_trange' not in state:
+            self._trange = old_trange
+        if old_data is not None:
+            self.data = old_data
+        if isinstance(self._spec_bins, pd.DataFrame):
+            self._spec_bins = self._spec_bins.values
+    
+    def __getstate__(self):
+        #Lazy data is read in, so the pickle doesn't depend on the loader
+        self.load()
+        #Derived data is saved as it is now, without the recipe
+        self.refresh()
+        #The statistics are rebuilt after loading
+        state = self.__dict__.copy()
+        state['_loader'] = None
+        state['recipe'] = None
+        state['input_versions'] = None
+        state['_input_numbers'] = None
+        state['_reductions'] = {}
+        del state['_lock']
+        state['_buffer'] = None
+        state['_stats'] = None
+        state['_spec_bins_stats'] = None
+        #Arrays moved to memory mapped files are saved as normal arrays
+        for attribute in ['_times', '_values', '_spec_bins', '_nd_values']:
+            if isinstance(state[attribute], np.memmap):
+                state[attribute] = np.asarray(state[attribute])
+        return state
         
     def _check_spec_bins_ordering(self):
         '''
         This is a private function of the TVar object, this is run during 
-        object creation to check if spec_bins are ascending or descending
+        object creation to check if spec_bins are ascending or descending.  
+        It also fills in spec_bins_monotonic, and if time varying spec_bins 
+        turn out to be the same at every time they are collapsed into a 
+        single row so they can be plotted like constant bins.  
         '''
         if self.spec_bins is None:
             return
-        if len(self.spec_bins) == len(self.data.index):
-            self.spec_bins_time_varying = True
-            break_top_loop = False
-            for index,row in self.spec_bins.iterrows():
-                if row.isnull().values.all():
-                    continue
-                else:
-                    for i in row.index:
-                        if np.isfinite(row[i]) and np.isfinite(row[i+1]):
-                            ascending = row[i] < row[i+1]
-                            break_top_loop = True
-                            break
-                        else:
-                            continue
-                    if break_top_loop:
-                        break
+        bins = self.spec_bins
+        if len(bins) == len(self.times) and len(bins) > 1:
+            if self._spec_bins_constant(bins):
+                bins = bins[:1].copy()
+                self.spec_bins = bins
+            else:
+                self.spec_bins_time_varying = True
+        #Steps between neighboring bins, NaN where either bin is not finite
+        with np.errstate(invalid='ignore'):
+            steps = np.diff(bins.astype(np.float64, copy=False), axis=1)
+        finite_steps = np.isfinite(steps)
+        #The first finite pair of bins decides the ordering
+        first_finite = np.flatnonzero(finite_steps)
+        if first_finite.size == 0:
+            ascending = True
+        else:
+            ascending = bool(steps.flat[first_finite[0]] > 0)
+        if ascending:
+            in_order = steps > 0
         else:
-            ascending = self.spec_bins[0].iloc[0] < self.spec_bins[1].iloc[0]
+            in_order = steps < 0
+        self.spec_bins_monotonic = np.all(in_order | ~finite_steps, axis=1)
         return ascending
+    
+    @staticmethod
+    def _spec_bins_constant(bins):
+        '''
+        Returns True if every row of spec_bins is the same as the first.  
+        NaNs count as equal to each other.  
+        '''
+        same = bins == bins[0]
+        if bins.dtype.kind == 'f':
+            same |= np.isnan(bins) & np.isnan(bins[0])
+        return bool(same.all())
         
     def link_to_tvar(self, name, link, method='linear'):
-        from scipy import interpolate
-        from scipy.interpolate import interp1d
+        from .align_data import interpolate_values, interp_methods
         from .store_data import store_data
+        if method not in interp_methods:
+            print('Error: choose interpolation method.')
+            print(', '.join(interp_methods))
+            return
         #pull saved variables from data_quants
-        link_timeorig = np.asarray(data_quants[link].data.index.tolist())
-        link_dataorig = np.asarray(data_quants[link].data[0].tolist())
-        tvar_timeorig = np.asarray(self.data.index.tolist())
-         
+        link_tvar = data_quants[link]
+        x = link_tvar.times
+        y = link_tvar.values[:,0]
         #shorten tvar array to be within link array
-        while tvar_timeorig[-1] > link_timeorig[-1]:
-            tvar_timeorig = np.delete(tvar_timeorig,-1)
-        while tvar_timeorig[0] < link_timeorig[0]:
-            tvar_timeorig = np.delete(tvar_timeorig,0)
+        xnew, _ = self.time_slice(x[0], x[-1])
      
-        x = link_timeorig
-        y = link_dataorig
-        xnew = tvar_timeorig
-     
-        #choose method, interpolate, plot, and store
-        if method == 'linear':
-            f = interp1d(x,y)
-            newvarname = link + "_" + self.name + "_link"
-            store_data(newvarname, data={'x':xnew,'y':f(xnew)})
-        elif method == 'cubic':
-            f2 = interp1d(x, y, kind='cubic')
-            newvarname = link + "_" + self.name + "_link"
-            store_data(newvarname, data={'x':xnew,'y':f2(xnew)})
-        elif method == 'quad_spline':
-            tck = interpolate.splrep(x,y,s=0,k=2)
-            ynew = interpolate.splev(xnew, tck, der=0)
-            newvarname = link + "_" + self.name + "_link"
-            store_data(newvarname, data={'x':xnew,'y':ynew})
-             
-        else:
-            print('Error: choose interpolation method.')
-            print('linear, cubic, quad_spline')
-            return
-
+        #interpolate and store
+        newvarname = link + "_" + self.name + "_link"
+        ynew = interpolate_values(x, y, xnew, method=method)[:,0]
+        store_data(newvarname, data={'x':xnew,'y':ynew})
+        
         self.links[name] = newvarname
         
 
 #Global Variables
 hover_time = HoverTime()
-data_quants = OrderedDict()
+data_quants = TVarRegistry()
 tplot_opt_glob = dict(tools = "xpan,crosshair,reset", 
                  min_border_top = 15, min_border_bottom = 0, 
                  title_align = 'center', window_size = [800, 800],
-                 title_size='12pt', title_text='')
+                 title_size='12pt', title_text='',
+                 memory_budget=None, spill_dir=None, precision=None,
+                 alignment_cache_size=2**28)
 lim_info = {}
 extra_layouts = {}
 
@@ -202,14 +922,18 @@ bokeh_plotters = {'bkTVarFigure1D':HTMLPlotter.TVarFigure1D,
                   'bkTVarFigureSpec':HTMLPlotter.TVarFigureSpec}
 
 from .store_data import store_data
+from .append_data import append_data
+from .register_lazy import register_lazy
 from .tplot import tplot
 from .get_data import get_data
+from .time_clip import time_clip
 from .xlim import xlim
 from .ylim import ylim
 from .zlim import zlim
 from .tlimit import tlimit
 from .tplot_save import tplot_save
 from .tplot_names import tplot_names
+from .tplot_memory import tplot_memory
 from .tplot_restore import tplot_restore
 from .get_timespan import get_timespan
 from .tplot_options import tplot_options
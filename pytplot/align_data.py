@@ -0,0 +1,202 @@
+# Copyright 2018 Regents of the University of Colorado. All Rights Reserved.
+# Released under the MIT license.
+# This software was developed at the University of Colorado's Laboratory for Atmospheric and Space Physics.
+# Verify current version before use at: https://github.com/MAVENSDC/PyTplot
+
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.interpolate import interp1d, make_interp_spline
+import pytplot
+from .tplot_utilities import float_dtype
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    #Python older than 3.8, the splines are always interpolated in this process
+    shared_memory = None
+
+interp_methods = ['linear', 'cubic', 'quad_spline']
+
+#Aligned values, from the least to the most recently used.  The keys are
+#(name, data version, hash of the new times, method).
+_cache = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+
+
+def interpolate_values(times, values, new_times, method='linear', workers=None):
+    '''
+    Interpolates every column of values (times x columns) onto new_times at
+    once, instead of one column at a time.
+
+    Parameters:
+        times : 1D array
+            The times of the values, in increasing order.
+        values : 2D array
+            The values, one row per time.
+        new_times : 1D array
+            The times to interpolate to.
+        method : str
+            "linear" (extended in a straight line past the ends), "cubic"
+            (cubic spline), or "quad_spline" (quadratic spline).
+        workers : int, optional
+            For "cubic" and "quad_spline", if more than 1, the columns are 
+            split into this many groups whose splines are worked out at the 
+            same time in a pool of processes.  The arrays are put in shared 
+            memory, so they are not copied to each process.  Starting the 
+            processes takes time, so this only helps with data that has many 
+            columns and samples (for example, wide spectrograms).  Linear 
+            interpolation is already fast enough that splitting it up only 
+            adds overhead, so workers is not used for it.  
+
+    Returns:
+        A 2D array with one row per new time, or None if the values cannot be
+        interpolated.  Float values keep their precision.
+    '''
+    if method not in interp_methods:
+        print('Error: choose interpolation method.')
+        print(', '.join(interp_methods))
+        return
+    times = np.asarray(times, dtype=np.float64)
+    new_times = np.asarray(new_times, dtype=np.float64)
+    values = np.asarray(values)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    if len(times) < 2:
+        print("At least 2 samples are needed to interpolate.")
+        return
+    dtype = float_dtype(values)
+    workers = min(workers or 1, values.shape[1])
+    if method == 'linear' or workers <= 1 or shared_memory is None or values.dtype.hasobject:
+        return _interpolate(times, values, new_times, method, dtype)
+    return _interpolate_in_processes(times, values, new_times, method, dtype, workers)
+
+def _interpolate(times, values, new_times, method, dtype):
+    if method == 'linear':
+        return _linear(times, values.astype(dtype, copy=False), new_times)
+    elif method == 'cubic':
+        f = interp1d(times, values, kind='cubic', axis=0, assume_sorted=True)
+        return f(new_times).astype(dtype, copy=False)
+    spline = make_interp_spline(times, values, k=2, axis=0)
+    return spline(new_times).astype(dtype, copy=False)
+
+def _interpolate_in_processes(times, values, new_times, method, dtype, workers):
+    #Each process reads the inputs from shared memory and fills in its own 
+    #columns of the result, which is also in shared memory
+    arrays = {'times': times, 'values': values, 'new_times': new_times,
+              'result': np.empty((len(new_times), values.shape[1]), dtype=dtype)}
+    blocks = []
+    try:
+        shared = {}
+        for key, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            copy = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+            copy[...] = array
+            shared[key] = (block.name, array.shape, array.dtype.str)
+        bounds = np.linspace(0, values.shape[1], workers+1).astype(int)
+        columns = [(bounds[i], bounds[i+1]) for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_fill_columns, [shared]*workers, columns, [method]*workers))
+        #copy is the result, the last array put in shared memory
+        result = copy.copy()
+        del copy
+        return result
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+def _fill_columns(shared, columns, method):
+    #Runs in a worker process, see _interpolate_in_processes
+    #The pool's processes share the resource tracker of the process that made 
+    #the shared memory, which removes it once when it is done
+    blocks = {key: shared_memory.SharedMemory(name=name) for key, (name, _, _) in shared.items()}
+    try:
+        arrays = {key: np.ndarray(shape, dtype=dtype, buffer=blocks[key].buf)
+                  for key, (_, shape, dtype) in shared.items()}
+        result = arrays['result']
+        first, last = columns
+        result[:, first:last] = _interpolate(arrays['times'], arrays['values'][:, first:last],
+                                             arrays['new_times'], method, result.dtype)
+        del arrays, result
+    finally:
+        for block in blocks.values():
+            block.close()
+
+def align_tvar(name, new_times, method='linear', workers=None):
+    '''
+    Returns the values of a tplot variable interpolated onto new_times (see
+    interpolate_values).  Results are kept in memory, so aligning the same
+    variable to the same times again (for example, when several tplot_math
+    functions use the same reference variable) doesn't interpolate again.
+    Results are only reused while the variable's data hasn't changed.
+
+    The memory the kept results can use is set with the "alignment_cache_size"
+    option of tplot_options, in bytes.  When it is full, the least recently
+    used results are dropped.  The arrays returned are read only, since they
+    can be returned again later.  workers is passed to interpolate_values.
+    '''
+    tvar = pytplot.data_quants[name]
+    times = tvar.times
+    values = tvar.values
+    new_times = np.ascontiguousarray(new_times)
+    key = (name, tvar.data_version, new_times.dtype.str,
+           hashlib.blake2b(new_times, digest_size=16).digest(), method)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    aligned = interpolate_values(times, values, new_times, method=method, workers=workers)
+    if aligned is None:
+        return
+    aligned.flags.writeable = False
+    _cache_add(key, aligned)
+    return aligned
+
+def clear_alignment_cache():
+    '''Drops all of the results kept by align_tvar'''
+    global _cache_bytes
+    with _cache_lock:
+        _cache.clear()
+        _cache_bytes = 0
+
+def enforce_alignment_cache_size():
+    '''Drops the least recently used results until they fit in the "alignment_cache_size"'''
+    global _cache_bytes
+    size = pytplot.tplot_opt_glob.get('alignment_cache_size') or 0
+    with _cache_lock:
+        while _cache and _cache_bytes > size:
+            _, dropped = _cache.popitem(last=False)
+            _cache_bytes -= dropped.nbytes
+
+def _cache_add(key, aligned):
+    global _cache_bytes
+    size = pytplot.tplot_opt_glob.get('alignment_cache_size') or 0
+    if aligned.nbytes > size:
+        return
+    with _cache_lock:
+        #Results for older data of the same variable can't be used again
+        for old_key in [old_key for old_key in _cache if old_key[0] == key[0] and old_key[1] != key[1]]:
+            _cache_bytes -= _cache.pop(old_key).nbytes
+        if key not in _cache:
+            _cache[key] = aligned
+            _cache_bytes += aligned.nbytes
+    enforce_alignment_cache_size()
+
+def _linear(times, values, new_times):
+    #Index of the sample at or before each new time.  Times before the first
+    #or after the last use the first or last pair of samples, which extends
+    #the line past the ends.
+    index = np.searchsorted(times, new_times, side='right') - 1
+    np.clip(index, 0, len(times)-2, out=index)
+    before = times[index]
+    #How far along each new time is between its two samples, as a column so
+    #it multiplies every column of values
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = (new_times - before)/(times[index+1] - before)
+    weight = weight.astype(values.dtype, copy=False)[:, np.newaxis]
+    lower = values[index]
+    return lower + weight*(values[index+1] - lower)
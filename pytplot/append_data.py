@@ -0,0 +1,108 @@
+# Copyright 2018 Regents of the University of Colorado. All Rights Reserved.
+# Released under the MIT license.
+# This software was developed at the University of Colorado's Laboratory for Atmospheric and Space Physics.
+# Verify current version before use at: https://github.com/MAVENSDC/PyTplot
+
+import numpy as np
+from pytplot import data_quants
+from .store_data import format_ydata
+from .memory_budget import enforce_memory_budget
+
+def append_data(name, x, y, v=None):
+    """
+    This function adds new samples to the end of a tplot variable.  Unlike calling 
+    store_data again with all of the data, only the new samples are copied and looked 
+    at, so this is fast enough to call every time a new packet of data comes in.  
+    
+    Parameters:
+        name : str 
+            Name of the tplot variable to add data to
+        x : int/float/array
+            The times of the new samples
+        y : array
+            The values of the new samples.  There should be one row per time, with the 
+            same number of columns as the tplot variable already has.  
+        v : array, optional
+            The spec_bins of the new samples, one row per time (or one row for all 
+            of them).  This is only needed if the spec_bins of the tplot variable 
+            vary in time.  If the variable's spec_bins were the same at every time 
+            and v is different, they are stored for each time from then on.  
+         
+    Returns:
+        None
+        
+    .. note::
+        The data of the tplot variable is kept in arrays with extra room at the end.  
+        The arrays returned by get_data can be changed by later calls to append_data, 
+        so copy them if you need to keep them.  
+        
+    Examples:
+        >>> # Add a packet of data to Variable1
+        >>> import pytplot
+        >>> pytplot.store_data("Variable1", data={'x':[1,2,3], 'y':[1,2,3]})
+        >>> pytplot.append_data("Variable1", [4,5], [4,5])
+        
+        >>> # Add a single sample of a 2 line variable
+        >>> pytplot.store_data("Variable2", data={'x':[1,2], 'y':[[1,5],[2,4]]})
+        >>> pytplot.append_data("Variable2", 3, [3,3])
+
+    """
+    
+    if name not in data_quants.keys():
+        print(str(name) + " is currently not in pytplot.")
+        return
+    tvar = data_quants[name]
+    if tvar.overlay is not None:
+        print("Cannot append data to a combination of tplot variables.")
+        return
+    if tvar.nd_values is not None:
+        print("Cannot append data to a tplot variable with more than 2 dimensions.")
+        return
+    
+    times = np.atleast_1d(np.asarray(x))
+    values = format_ydata(np.atleast_1d(y))
+    if values.dtype.kind in 'biuf' and tvar.values.dtype.kind == 'f':
+        #Numbers added to float data are kept in the precision of the tplot 
+        #variable, so that integers don't turn float32 data into float64
+        values = values.astype(tvar.values.dtype, copy=False)
+    if len(times) == 1 and values.shape == (tvar.values.shape[1], 1):
+        #A single sample given as a flat list
+        values = values.reshape(1, -1)
+        
+    if times.ndim != 1:
+        print("x must be 1 dimensional!")
+        return
+    if len(times) != len(values):
+        print("The lengths of x and y do not match!")
+        return
+    if values.shape[1] != tvar.values.shape[1]:
+        print("y must have " + str(tvar.values.shape[1]) + " columns to be added to " + str(name) + ".")
+        return
+    
+    spec_bins = None
+    if tvar.spec_bins_time_varying and v is None:
+        print("The spec_bins of " + str(name) + " vary in time, so v must be given.")
+        return
+    if v is not None and tvar.spec_bins is not None:
+        spec_bins = np.array(v)
+        if spec_bins.dtype.kind in 'biuf' and tvar.spec_bins.dtype.kind == 'f':
+            spec_bins = spec_bins.astype(tvar.spec_bins.dtype, copy=False)
+        if spec_bins.ndim == 1:
+            spec_bins = np.tile(spec_bins, (len(times), 1))
+        if spec_bins.shape != (len(times), tvar.spec_bins.shape[1]):
+            print("Length of v and x do not match.")
+            return
+        if not tvar.spec_bins_time_varying:
+            if tvar._spec_bins_constant(np.concatenate([tvar.spec_bins, spec_bins])):
+                #The same bins as before, so they stay stored once
+                spec_bins = None
+            else:
+                #Bins that were the same at every time were kept as one row.  
+                #Now that they differ, they go back to one row per sample.
+                tvar.spec_bins = np.repeat(tvar.spec_bins, len(tvar.times), axis=0)
+                tvar.spec_bins_time_varying = True
+    
+    tvar.append(times, values, spec_bins)
+    enforce_memory_budget()
+    
+    return
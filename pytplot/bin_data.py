@@ -0,0 +1,137 @@
+# Copyright 2018 Regents of the University of Colorado. All Rights Reserved.
+# Released under the MIT license.
+# This software was developed at the University of Colorado's Laboratory for Atmospheric and Space Physics.
+# Verify current version before use at: https://github.com/MAVENSDC/PyTplot
+
+import numpy as np
+from .tplot_utilities import float_dtype
+
+bin_methods = ['mean', 'median', 'min', 'max', 'std', 'count', 'sum']
+
+
+def bin_values(times, values, res, method='mean', start=None):
+    '''
+    Splits the times into bins of width res and reduces every column of the
+    values in each bin at once.  Each sample goes in the bin from
+    start + k*res (inclusive) to start + (k+1)*res (exclusive).  NaN values
+    are ignored.
+
+    Parameters:
+        times : 1D array
+            The times of the values, in increasing order.
+        values : 2D array
+            The values, one row per time.  Rows whose time is NaN or 
+            infinite are left out.  
+        res : flt
+            The width of the bins, in seconds.
+        method : str
+            "mean", "median", "min", "max", "std", "count" or "sum".
+        start : flt, optional
+            The start of the first bin.  By default, the first time.
+
+    Returns:
+        bin_times : 1D array
+            The start time of each bin, from start up to the bin of the last
+            time.
+        bin_values : 2D array
+            The reduced values, one row per bin.  Bins with no values are NaN,
+            or 0 for "count" and "sum".
+    '''
+    if method not in bin_methods:
+        print('Error: choose binning method.')
+        print(', '.join(bin_methods))
+        return
+    if res <= 0:
+        print('The resolution must be greater than 0.')
+        return
+    times = np.asarray(times, dtype=np.float64)
+    values = np.asarray(values)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    values = values.astype(float_dtype(values), copy=False)
+    #Samples without a valid time aren't in any bin
+    finite = np.isfinite(times)
+    if not finite.all():
+        times = times[finite]
+        values = values[finite]
+    if not len(times):
+        return np.array([]), np.empty((0,) + values.shape[1:], dtype=values.dtype)
+    if start is None:
+        start = times[0]
+    #Samples before the start aren't in any bin
+    first = np.searchsorted(times, start, side='left')
+    times = times[first:]
+    values = values[first:]
+    if not len(times):
+        return np.array([]), np.empty((0,) + values.shape[1:], dtype=values.dtype)
+    nbins = int((times[-1] - start)//res) + 1
+    #Rounding can put the last time just outside of the last bin
+    if start + nbins*res <= times[-1]:
+        nbins += 1
+    elif nbins > 1 and start + (nbins-1)*res > times[-1]:
+        nbins -= 1
+    bin_times = start + np.arange(nbins)*res
+    empty = 0 if method in ['count', 'sum'] else np.nan
+    result = np.full((nbins,) + values.shape[1:], empty, dtype=values.dtype)
+
+    #The times are in order, so the samples of each bin are next to each 
+    #other.  A binary search for each bin edge finds where each run starts, 
+    #and reduceat works on all of the runs at once.  
+    edges = np.searchsorted(times, bin_times, side='left')
+    lengths = np.diff(np.r_[edges, len(times)])
+    filled = np.flatnonzero(lengths)
+    starts = edges[filled]
+    lengths = lengths[filled]
+
+    nan = np.isnan(values)
+    has_nan = nan.any()
+    #Number of values in each bin and column, not counting NaN
+    count = np.broadcast_to(lengths.reshape((-1,) + (1,)*(values.ndim-1)),
+                            (len(starts),) + values.shape[1:])
+    if has_nan:
+        count = count - np.add.reduceat(nan, starts, axis=0)
+    if method == 'count':
+        result[filled] = count
+        return bin_times, result
+    if method == 'min':
+        #fmin and fmax skip NaN unless all of the values are NaN
+        result[filled] = np.fmin.reduceat(values, starts, axis=0)
+        return bin_times, result
+    if method == 'max':
+        result[filled] = np.fmax.reduceat(values, starts, axis=0)
+        return bin_times, result
+    if method == 'median':
+        result[filled] = _median(values, np.repeat(filled, lengths), starts, count)
+        return bin_times, result
+
+    if has_nan:
+        values = np.where(nan, 0, values)
+    total = np.add.reduceat(values, starts, axis=0)
+    if method == 'sum':
+        result[filled] = total
+        return bin_times, result
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = total/count
+        if method == 'mean':
+            result[filled] = mean
+            return bin_times, result
+        #Standard deviation (like np.nanstd), from the distance of each value
+        #to the mean of its bin
+        deviation = values - np.repeat(mean, lengths, axis=0)
+        if has_nan:
+            deviation[nan] = 0
+        result[filled] = np.sqrt(np.add.reduceat(deviation**2, starts, axis=0)/count)
+    return bin_times, result
+
+def _median(values, bins, starts, count):
+    #Sorts each column by bin, then by value, so the values of each bin are in
+    #order (NaN sorts last).  The median is in the middle of the valid values.
+    keys = np.broadcast_to(bins, values.T.shape)
+    order = np.lexsort((values.T, keys)).T
+    ordered = np.take_along_axis(values, order, axis=0)
+    columns = np.arange(values.shape[1])
+    low = starts[:, np.newaxis] + np.maximum(count - 1, 0)//2
+    high = starts[:, np.newaxis] + count//2
+    median = (ordered[low, columns] + ordered[high, columns])/2
+    median[count == 0] = np.nan
+    return median
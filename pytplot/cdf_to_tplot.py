@@ -6,12 +6,15 @@
 import cdflib
 import re
 import numpy as np
+from functools import partial
 from .store_data import store_data
+from .register_lazy import register_lazy
 from .tplot import tplot
 from .options import options
+from pytplot import data_quants
 
 def cdf_to_tplot(filenames, varformat=None, get_support_data=False,
-                 prefix='', suffix='', plot=False):
+                 prefix='', suffix='', plot=False, lazy=False):
     """
     This function will automatically create tplot variables from CDF files.    
     
@@ -43,6 +46,11 @@ def cdf_to_tplot(filenames, varformat=None, get_support_data=False,
         plot: bool
             The data is plotted immediately after being generated.  All tplot 
             variables generated from this function will be on the same plot.  
+        lazy: bool
+            If True, the tplot variables are created without reading their data.  
+            Each variable is read from its file the first time it is used.  
+            This is much faster when only a few of the variables in the files 
+            will be looked at.  By default, all data is read immediately.  
             
     Returns:
         List of tplot variables created.
@@ -62,6 +70,12 @@ def cdf_to_tplot(filenames, varformat=None, get_support_data=False,
         >>> import pytplot
         >>> file = "C:/mavencdfs/mvn_swe_l2_svyspec_20170725_v04_r04.cdf"
         >>> pytplot.cdf_to_tplot(file, varformat="diff*")
+        
+        >>> #Only read the variables that get used
+        >>> import pytplot
+        >>> file = "C:/mavencdfs/mvn_swe_l2_svyspec_20170725_v04_r04.cdf"
+        >>> pytplot.cdf_to_tplot(file, lazy=True)
+        >>> pytplot.tplot("diff_en_fluxes")
 
     """
     stored_variables=[]
@@ -104,64 +118,32 @@ def cdf_to_tplot(filenames, varformat=None, get_support_data=False,
                 continue
             
             if var_atts['VAR_TYPE'] in var_type:
-                var_atts = cdf_file.varattsget(var)
-                var_properties = cdf_file.varinq(var)
-                if "DEPEND_TIME" in var_atts:
-                    x_axis_var = var_atts["DEPEND_TIME"]
-                elif "DEPEND_0" in var_atts:
-                    x_axis_var = var_atts["DEPEND_0"]
-                else:
+                if _x_axis_variable(var_atts) is None:
                     print("Cannot find x axis.")
                     print("No attribute named DEPEND_TIME or DEPEND_0 in variable "+var)
                     continue
-                data_type_description = cdf_file.varinq(x_axis_var)['Data_Type_Description']
-                xdata=cdf_file.varget(x_axis_var)
-                
-                if 'CDF_TIME' or 'CDF_EPOCH' in data_type_description:
-                    xdata = cdflib.cdfepoch.unixtime(xdata)
-                ydata=cdf_file.varget(var)
-                if ydata is None:
-                    continue
-                if "FILLVAL" in var_atts:
-                    if (var_properties['Data_Type_Description'] == 'CDF_FLOAT' or
-                        var_properties['Data_Type_Description'] == 'CDF_REAL4' or 
-                        var_properties['Data_Type_Description'] == 'CDF_DOUBLE' or 
-                        var_properties['Data_Type_Description'] == 'CDF_REAL8'):
-                        
-                        if ydata[ydata==var_atts["FILLVAL"]].size != 0:
-                            ydata[ydata==var_atts["FILLVAL"]] = np.nan
-                        
-                    
                 
                 var_name = prefix+var+suffix
-                tplot_data ={'x':xdata,'y':ydata}
-                
-                depend_1 = None
-                depend_2 = None
-                if "DEPEND_1" in var_atts:
-                    if var_atts["DEPEND_1"] in all_cdf_variables:
-                        depend_1 = cdf_file.varget(var_atts["DEPEND_1"])
-                if "DEPEND_2" in var_atts:
-                    if var_atts["DEPEND_2"] in all_cdf_variables:
-                        depend_2 = cdf_file.varget(var_atts["DEPEND_2"])
-                if depend_1 is not None and depend_2 is not None:
-                    tplot_data['v1'] = depend_1
-                    tplot_data['v2'] = depend_2
-                elif depend_1 is not None:
-                    tplot_data['v'] = depend_1
-                elif depend_2 is not None:
-                    tplot_data['v'] = depend_2
-                    
-                    
-                store_data(var_name, data=tplot_data)
+                if lazy:
+                    register_lazy(var_name, partial(load_cdf_variable, filename, var))
+                else:
+                    tplot_data = _read_cdf_variable(cdf_file, var, all_cdf_variables)
+                    if tplot_data is None:
+                        continue
+                    #The arrays were just read from the file, so there is no need to copy them
+                    store_data(var_name, data=tplot_data, copy=False)
                 stored_variables.append(var_name)
                 
                 display_type = var_atts.get("DISPLAY_TYPE", "time_series")
                 scale_type = var_atts.get("SCALE_TYP", "linear")
                 if display_type == "spectrogram": 
-                    options(var, 'spec', 1)
+                    options(var_name, 'spec', 1)
                 if scale_type == 'log':
-                    options(var, 'ylog', 1)
+                    if lazy:
+                        #Checking the data for negative numbers would read it in
+                        data_quants[var_name].yaxis_opt['y_axis_type'] = 'log'
+                    else:
+                        options(var_name, 'ylog', 1)
                         
         cdf_file.close()     
     
@@ -169,3 +151,93 @@ def cdf_to_tplot(filenames, varformat=None, get_support_data=False,
         tplot(stored_variables)
     
     return stored_variables
+
+
+def load_cdf_variable(filename, var, startrec=0, endrec=None):
+    """
+    This function reads a single variable from a CDF file, in the format that 
+    store_data takes.  This is what lazy variables from cdf_to_tplot call 
+    when their data is first needed.  
+    
+    Parameters:
+        filename : str
+            The file name and full path of the CDF file.  
+        var : str
+            The name of the variable in the CDF file.  
+        startrec : int, optional
+            The first record to read.  By default, reads from the first record.  
+        endrec : int, optional
+            The last record to read.  By default, reads to the last record.  
+            
+    Returns:
+        A dictionary with 'x', 'y', and possibly 'v' (or 'v1', 'v2' and 'v3'), 
+        or None if the variable could not be read.  
+    """
+    cdf_file = cdflib.CDF(filename)
+    cdf_info = cdf_file.cdf_info()
+    all_cdf_variables = cdf_info['rVariables'] + cdf_info['zVariables']
+    tplot_data = _read_cdf_variable(cdf_file, var, all_cdf_variables, 
+                                    startrec=startrec, endrec=endrec)
+    cdf_file.close()
+    return tplot_data
+
+def _x_axis_variable(var_atts):
+    #Name of the variable holding the times, or None if there is not one
+    if "DEPEND_TIME" in var_atts:
+        return var_atts["DEPEND_TIME"]
+    elif "DEPEND_0" in var_atts:
+        return var_atts["DEPEND_0"]
+    return None
+
+def _read_cdf_variable(cdf_file, var, all_cdf_variables, startrec=0, endrec=None):
+    var_atts = cdf_file.varattsget(var)
+    var_properties = cdf_file.varinq(var)
+    x_axis_var = _x_axis_variable(var_atts)
+    if x_axis_var is None:
+        print("No attribute named DEPEND_TIME or DEPEND_0 in variable "+var)
+        return
+    data_type_description = cdf_file.varinq(x_axis_var)['Data_Type_Description']
+    xdata=cdf_file.varget(x_axis_var, startrec=startrec, endrec=endrec)
+    
+    if 'CDF_TIME' or 'CDF_EPOCH' in data_type_description:
+        xdata = cdflib.cdfepoch.unixtime(xdata)
+    ydata=cdf_file.varget(var, startrec=startrec, endrec=endrec)
+    if ydata is None:
+        return
+    if "FILLVAL" in var_atts:
+        if (var_properties['Data_Type_Description'] == 'CDF_FLOAT' or
+            var_properties['Data_Type_Description'] == 'CDF_REAL4' or 
+            var_properties['Data_Type_Description'] == 'CDF_DOUBLE' or 
+            var_properties['Data_Type_Description'] == 'CDF_REAL8'):
+            
+            if ydata[ydata==var_atts["FILLVAL"]].size != 0:
+                ydata[ydata==var_atts["FILLVAL"]] = np.nan
+    
+    tplot_data ={'x':xdata,'y':ydata}
+    
+    depend_1 = None
+    depend_2 = None
+    if "DEPEND_1" in var_atts:
+        if var_atts["DEPEND_1"] in all_cdf_variables:
+            depend_1 = _read_depend(cdf_file, var_atts["DEPEND_1"], startrec, endrec)
+    if "DEPEND_2" in var_atts:
+        if var_atts["DEPEND_2"] in all_cdf_variables:
+            depend_2 = _read_depend(cdf_file, var_atts["DEPEND_2"], startrec, endrec)
+    if depend_1 is not None and depend_2 is not None:
+        tplot_data['v1'] = depend_1
+        tplot_data['v2'] = depend_2
+        if "DEPEND_3" in var_atts and var_atts["DEPEND_3"] in all_cdf_variables:
+            tplot_data['v3'] = _read_depend(cdf_file, var_atts["DEPEND_3"], startrec, endrec)
+    elif depend_1 is not None:
+        tplot_data['v'] = depend_1
+    elif depend_2 is not None:
+        tplot_data['v'] = depend_2
+    
+    return tplot_data
+
+def _read_depend(cdf_file, depend_var, startrec, endrec):
+    #Axis values that change with time have one record per time, so the same 
+    #records as the data are read.  Otherwise there is only one record.  
+    if cdf_file.varinq(depend_var)['Rec_Vary']:
+        return cdf_file.varget(depend_var, startrec=startrec, endrec=endrec)
+    return cdf_file.varget(depend_var)
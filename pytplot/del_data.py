@@ -4,7 +4,7 @@
 # Verify current version before use at: https://github.com/MAVENSDC/PyTplot
 
 from pytplot import data_quants
-import fnmatch
+from .tvar_registry import is_wildcard
 
 def del_data(name=None):
     """
@@ -13,7 +13,9 @@ def del_data(name=None):
     Parameters:
         name : str 
             Name of the tplot variable to be deleted.  If no name is provided, then 
-            all tplot variables will be deleted.  
+            all tplot variables will be deleted.  The wildcards "*" and "?" can be used.  
+            Combinations of tplot variables stop showing the deleted variables, 
+            and are deleted too if they are left with nothing to show.  
          
     Returns:
         None
@@ -22,31 +24,25 @@ def del_data(name=None):
         >>> # Delete Variable 1
         >>> import pytplot
         >>> pytplot.del_data("Varaible1")
+        
+        >>> # Delete all variables starting with mms1_
+        >>> pytplot.del_data("mms1_*")
 
     """
     if name is None:
-        tplot_names = list(data_quants.keys())
-        for i in tplot_names:
-            del data_quants[i]
+        data_quants.clear()
         return
     
     if not isinstance(name, list):
         name = [name]
     
-    entries = []  
-    ###    
     for i in name:
-        if ('?' in i) or ('*' in i):
-            for j in data_quants.keys():
-                var_verif = fnmatch.fnmatch(data_quants[j].name, i)
-                if var_verif == 1:
-                    entries.append(data_quants[j].name)
-                else:
-                    continue
-            for key in entries:
+        if is_wildcard(i):
+            #The registry only tests the names that can match
+            for key in data_quants.match(i):
+                #Deleting a variable can delete combinations left empty by it
                 if key in data_quants:
-                    del data_quants[key]       
-    ###            
+                    del data_quants[key]
         elif i not in data_quants.keys():
             print(str(i) + " is currently not in pytplot.")
             return
@@ -57,4 +53,4 @@ def del_data(name=None):
             
             del data_quants[str_name]
         
-    return
\ No newline at end of file
+    return
@@ -4,18 +4,24 @@
 # Verify current version before use at: https://github.com/MAVENSDC/PyTplot
 
 from pytplot import data_quants
+from .time_clip import time_clip
 
-def get_data(name):
+def get_data(name, trange=None):
     """
     This function will get extract the data from the Tplot Variables stored in memory.  
     
     Parameters:
         name : str 
             Name of the tplot variable
+        trange : list, optional
+            The start and end times of the data to return.  The arrays returned are 
+            views of the stored data, found by binary search (see time_clip).  
          
     Returns:
-        time_val : pandas dataframe index
-        data_val : list
+        time_val : numpy array
+            The times of the data
+        data_val : numpy array
+            The data values, with one column per line of data
             
     Examples:
         >>> # Retrieve the data from Variable 1
@@ -24,6 +30,9 @@ def get_data(name):
         >>> y_data = [1,2,3,4,5]
         >>> pytplot.store_data("Variable1", data={'x':x_data, 'y':y_data})
         >>> time, data = pytplot.get_data("Variable1")
+        
+        >>> # Only the data between times 2 and 4
+        >>> time, data = pytplot.get_data("Variable1", trange=[2, 4])
 
     """
     
@@ -32,8 +41,11 @@ def get_data(name):
         print("That name is currently not in pytplot")
         return
     
+    if trange is not None:
+        return time_clip(name, trange[0], trange[1])
+    
     temp_data_quant = data_quants[name]
-    data_val = temp_data_quant.data.values
-    time_val = temp_data_quant.data.index
+    data_val = temp_data_quant.values
+    time_val = temp_data_quant.times
     
     return(time_val, data_val)
\ No newline at end of file
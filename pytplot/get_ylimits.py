@@ -3,6 +3,7 @@
 # This software was developed at the University of Colorado's Laboratory for Atmospheric and Space Physics.
 # Verify current version before use at: https://github.com/MAVENSDC/PyTplot
 
+import numpy as np
 from pytplot import data_quants
 
 
@@ -43,26 +44,23 @@ def get_ylimits(name, trg = None):
             print(str(name[i]) + " is currently not in pytplot.")
             return
         temp_data_quant = data_quants[name[i]]
-        yother = temp_data_quant.data
         if trg is not None:
-            for column_name in yother.columns:
-                y = yother[column_name]
-                trunc_tempt_data_quant = y.truncate(before = trg[0], after = trg[1])
-                loc_min = trunc_tempt_data_quant.min(skipna=True)
-                loc_max = trunc_tempt_data_quant.max(skipna=True)
-                if (ymin is None) or (loc_min < ymin):
-                    ymin = loc_min
-                if (ymax is None) or (loc_max > ymax):
-                    ymax = loc_max
+            first, last = temp_data_quant.time_indices(trg[0], trg[1])
+            yother = temp_data_quant.values[first:last]
+            if yother.size == 0 or np.isnan(yother).all():
+                continue
+            loc_min = np.nanmin(yother)
+            loc_max = np.nanmax(yother)
         else:
-            for column_name in yother.columns:
-                y = yother[column_name]
-                loc_min = y.min(skipna=True)
-                loc_max = y.max(skipna=False)
-                if (ymin is None) or (loc_min < ymin):
-                    ymin = loc_min
-                if (ymax is None) or (loc_max > ymax):
-                    ymax = loc_max
+            #No time range, so the stored statistics cover it
+            if temp_data_quant.stats.finite_count == 0:
+                continue
+            loc_min = temp_data_quant.stats.min
+            loc_max = temp_data_quant.stats.max
+        if (ymin is None) or (loc_min < ymin):
+            ymin = loc_min
+        if (ymax is None) or (loc_max > ymax):
+            ymax = loc_max
     print("Y Minimum: " + str(ymin))
     print("Y Maximum: " + str(ymax))
     
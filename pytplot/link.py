@@ -8,8 +8,7 @@ from pytplot import data_quants
 def link(names, link_name, link_type='alt'):
     
     link_type = link_type.lower()
-    if not isinstance(names, list):
-        names = [names]
+    names = data_quants.select(names)
         
     for i in names:
         if i not in data_quants.keys():
@@ -0,0 +1,172 @@
+# Copyright 2018 Regents of the University of Colorado. All Rights Reserved.
+# Released under the MIT license.
+# This software was developed at the University of Colorado's Laboratory for Atmospheric and Space Physics.
+# Verify current version before use at: https://github.com/MAVENSDC/PyTplot
+
+import atexit
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+import numpy as np
+import pytplot
+
+#Every time a TVar's data is used it takes the next number, so the
+#least recently used TVars have the smallest numbers
+use_counter = itertools.count()
+
+_spill_file_counter = itertools.count()
+_default_spill_dir = None
+#Only one thread moves data to files at a time
+_budget_lock = threading.Lock()
+
+
+def enforce_memory_budget():
+    '''
+    If the arrays of the tplot variables take up more memory than the
+    "memory_budget" set with tplot_options, the arrays of the least recently
+    used variables are moved into memory mapped files until they fit.
+    The variables work the same as before, the operating system just reads
+    the data back from the file when it is used.
+    '''
+    budget = pytplot.tplot_opt_glob.get('memory_budget')
+    if budget is None:
+        return
+    with _budget_lock:
+        tvars = [tvar for tvar in pytplot.data_quants.values() if not tvar.is_lazy]
+        #The arrays that own the memory in use, and the variables using each.  
+        #Views share the memory of their owner, so it is only counted once, 
+        #and only counted as freed when no variable in memory uses it.  
+        owners, users = _resident_owners(tvars)
+        total = sum(owner.nbytes for owner in owners.values())
+        if total <= budget:
+            return
+        #Arrays shared by several variables are only written once
+        spilled = {}
+        for tvar in sorted(tvars, key=lambda tvar: tvar._last_used):
+            if total <= budget:
+                break
+            for owner_id in spill_tvar(tvar, spilled):
+                if owner_id not in users:
+                    continue
+                users[owner_id].discard(id(tvar))
+                if not users[owner_id]:
+                    total -= owners[owner_id].nbytes
+                    del users[owner_id]
+    return
+
+def resident_bytes(tvars):
+    '''
+    Returns the number of bytes in memory used by the arrays of the given
+    tplot variables.  Arrays that are memory mapped, or that share memory with
+    arrays already counted (views, or arrays used by several variables), are 
+    not counted (again).
+    '''
+    owners, _ = _resident_owners(tvars)
+    return sum(owner.nbytes for owner in owners.values())
+
+def array_owner(array):
+    '''Returns the array that owns the memory of an array that may be a view'''
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array
+
+def _resident_owners(tvars):
+    #id -> owning array that isn't memory mapped, and id -> set of ids of 
+    #the variables that use it
+    owners = {}
+    users = {}
+    for tvar in tvars:
+        for array in _tvar_arrays(tvar):
+            owner = array_owner(array)
+            if isinstance(owner, np.memmap):
+                continue
+            owners[id(owner)] = owner
+            users.setdefault(id(owner), set()).add(id(tvar))
+    return owners, users
+
+def spill_tvar(tvar, spilled=None):
+    '''
+    Moves the arrays of a tplot variable into memory mapped files in the
+    "spill_dir" set with tplot_options (a temporary directory by default).
+    Arrays that are views of a larger array are moved along with it, so 
+    they still share memory with its other views.  
+
+    Returns the ids of the arrays owning memory that the variable no longer 
+    uses.  The memory is freed once nothing else uses them.  A variable that 
+    another thread is loading or changing is left alone.  
+    '''
+    if spilled is None:
+        spilled = {}
+    #Waiting could deadlock with a thread that holds the variable's lock and 
+    #is waiting for the memory budget, so a busy variable is skipped
+    if not tvar._lock.acquire(blocking=False):
+        return set()
+    try:
+        released = set()
+        #The preallocated arrays for appending and the results of reduce() are 
+        #let go, they are rebuilt when needed
+        for array in tvar._reductions.values():
+            if isinstance(array, np.ndarray):
+                released.add(id(array_owner(array)))
+        tvar._buffer = None
+        tvar._reductions = {}
+        for attribute in ['_times', '_values', '_spec_bins', '_nd_values']:
+            array = getattr(tvar, attribute)
+            if not isinstance(array, np.ndarray) or array.dtype.hasobject:
+                continue
+            owner = array_owner(array)
+            if isinstance(owner, np.memmap):
+                continue
+            #Set directly, the values and statistics are the same
+            setattr(tvar, attribute, _spilled_array(array, owner, spilled))
+            released.add(id(owner))
+        return released
+    finally:
+        tvar._lock.release()
+
+def _spilled_array(array, owner, spilled):
+    #The memory mapped copy of an array.  A view of a contiguous owner becomes 
+    #the same view of the owner's copy.
+    #(The original is kept with its copy, so that its id isn't reused)
+    if owner is array or not owner.flags.c_contiguous:
+        if id(array) not in spilled:
+            spilled[id(array)] = (array, _to_memmap(array))
+        return spilled[id(array)][1]
+    if id(owner) not in spilled:
+        spilled[id(owner)] = (owner, _to_memmap(owner))
+    offset = array.__array_interface__['data'][0] - owner.__array_interface__['data'][0]
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=spilled[id(owner)][1],
+                      offset=offset, strides=array.strides)
+    return view.view(np.memmap)
+
+def _tvar_arrays(tvar):
+    arrays = [tvar._times, tvar._values, tvar._spec_bins, tvar._nd_values]
+    arrays += list(tvar._reductions.values())
+    return [array for array in arrays if isinstance(array, np.ndarray)]
+
+def _to_memmap(array):
+    filename = os.path.join(_spill_dir(), str(next(_spill_file_counter)) + '.npy')
+    mapped = np.lib.format.open_memmap(filename, mode='w+', dtype=array.dtype, shape=array.shape)
+    mapped[...] = array
+    mapped.flush()
+    #The mapping stays valid after the file is removed, and the disk space is
+    #given back once the array is no longer used.  Windows does not allow this,
+    #so there the files are removed when python exits.
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
+    return mapped
+
+def _spill_dir():
+    global _default_spill_dir
+    spill_dir = pytplot.tplot_opt_glob.get('spill_dir')
+    if spill_dir is not None:
+        os.makedirs(spill_dir, exist_ok=True)
+        return spill_dir
+    if _default_spill_dir is None:
+        _default_spill_dir = tempfile.mkdtemp(prefix='pytplot_spill_')
+        atexit.register(shutil.rmtree, _default_spill_dir, True)
+    return _default_spill_dir
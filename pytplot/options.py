@@ -4,15 +4,14 @@
 # Verify current version before use at: https://github.com/MAVENSDC/PyTplot
 
 from pytplot import data_quants
-import numpy as np
 
 def options(name, option, value):
     """
     This function allows the user to set a large variety of options for individual plots.  
     
     Parameters:
-        name : str 
-            Name of the tplot variable
+        name : str/list 
+            Name of the tplot variable(s).  The wildcards "*" and "?" can be used.  
         option : str
             The name of the option.  See section below  
         value : str/int/float/list
@@ -61,8 +60,7 @@ def options(name, option, value):
     """
     #if isinstance(name,int):
     #    name = tplot_common.data_quants.keys()[name]
-    if not isinstance(name, list):
-        name = [name]
+    name = data_quants.select(name)
     
     option = option.lower()
     
@@ -98,30 +96,22 @@ def options(name, option, value):
         
         if option == 'ylog':
             negflag = 0
-            namedata =  data_quants[i]
             ##check variable data
             #if negative numbers, don't allow log setting
-            datasets = []
-            if isinstance(namedata.data, list):
-                for oplot_name in namedata.data:
-                    datasets.append(data_quants[oplot_name])
-            else:
-                datasets.append(namedata)
+            datasets = data_quants.base_tvars(i)
                 
             for dataset in datasets:
                 if 'spec' not in dataset.extras:
-                    for column in dataset.data:
-                        if np.nanmin(dataset.data[column]) < 0:
+                    if dataset.stats.min < 0:
+                        print('Negative data is incompatible with log plotting.')
+                        negflag = 1
+                        break
+                else:
+                    if dataset.extras['spec'] == 1:
+                        if dataset.spec_bins_stats.min < 0:
                             print('Negative data is incompatible with log plotting.')
                             negflag = 1
                             break
-                else:
-                    if dataset.extras['spec'] == 1:
-                        for column in dataset.spec_bins:
-                            if np.nanmin(dataset.spec_bins[column]) < 0:
-                                print('Negative data is incompatible with log plotting.')
-                                negflag = 1
-                                break
                         
             if value == 1 and negflag == 0:
                 data_quants[i].yaxis_opt['y_axis_type'] = 'log'
@@ -134,25 +124,17 @@ def options(name, option, value):
         
         if option == 'zlog':
             negflag = 0
-            namedata =  data_quants[i]
             ##check variable data
             #if negative numbers, don't allow log setting
-            datasets = []
-            if isinstance(namedata.data, list):
-                for oplot_name in namedata.data:
-                    datasets.append(data_quants[oplot_name])
-            else:
-                datasets.append(namedata)
+            datasets = data_quants.base_tvars(i)
                 
             for dataset in datasets:
                 if 'spec' in dataset.extras:                       
                     if dataset.extras['spec'] == 1:
                         negflag = 0
-                        for column in dataset.data:
-                            if np.nanmin(dataset.data[column])  < 0:
-                                print('Negative data is incompatible with log plotting.')
-                                negflag = 1
-                                break
+                        if dataset.stats.min < 0:
+                            print('Negative data is incompatible with log plotting.')
+                            negflag = 1
                         #verify there are no negative values
                         if negflag == 0 and value == 1:
                             data_quants[i].zaxis_opt['z_axis_type'] = 'log'
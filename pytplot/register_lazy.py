@@ -0,0 +1,51 @@
+# Copyright 2018 Regents of the University of Colorado. All Rights Reserved.
+# Released under the MIT license.
+# This software was developed at the University of Colorado's Laboratory for Atmospheric and Space Physics.
+# Verify current version before use at: https://github.com/MAVENSDC/PyTplot
+
+from .store_data import store_data
+
+def register_lazy(name, loader):
+    """
+    This function creates a "Tplot Variable" without reading in its data.  
+    The loader is called the first time the data is needed (for example, by 
+    get_data, tplot, or any of the tplot_math functions), and the result is 
+    kept in memory from then on.  Until then, only the name and plot options 
+    of the variable are stored.  
+    
+    Parameters:
+        name : str 
+            Name of the tplot variable that will be created
+        loader : function
+            A function that takes no arguments, and returns a dictionary in the 
+            same format as the "data" parameter of store_data.  The arrays it returns 
+            are stored without being copied, so they should be new arrays.  If the 
+            data cannot be read, it should return None.  
+        
+    Returns:
+        None
+        
+    Examples:
+        >>> # Read a column of a large text file only if it is used
+        >>> import pytplot
+        >>> import numpy as np
+        >>> def read_density():
+        >>>     table = np.loadtxt("C:/data/density.txt")
+        >>>     return {'x':table[:,0], 'y':table[:,1]}
+        >>> pytplot.register_lazy("density", read_density)
+        >>> time, data = pytplot.get_data("density")
+        
+        >>> # Read a variable from a CDF file only if it is used
+        >>> from functools import partial
+        >>> from pytplot.cdf_to_tplot import load_cdf_variable
+        >>> file = "C:/mavencdfs/mvn_swe_l2_svyspec_20170725_v04_r04.cdf"
+        >>> pytplot.register_lazy("diff_en_fluxes", partial(load_cdf_variable, file, "diff_en_fluxes"))
+
+    """
+    
+    if not callable(loader):
+        print("The loader must be a function.")
+        return
+    
+    store_data(name, data=loader)
+    return
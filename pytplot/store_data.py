@@ -5,15 +5,17 @@
 
 from __future__ import division
 import datetime
-import pandas as pd
 import numpy as np
 from pytplot import data_quants, TVar
 from .del_data import del_data
+from .memory_budget import enforce_memory_budget
+from .tplot_utilities import valid_precision, apply_precision
 import pytplot
 
 tplot_num = 1
 
-def store_data(name, data=None, delete=False, newname=None):
+def store_data(name, data=None, delete=False, newname=None, copy=True, 
+               max_samples=None, max_seconds=None, precision=None):
     
     """
     This function creates a "Tplot Variable" based on the inputs, and
@@ -26,17 +28,40 @@ def store_data(name, data=None, delete=False, newname=None):
         data : dict
             A python dictionary object.  
             
-            'x' should be a 1-dimensional array that represents the data's x axis.  Typically this data is time, represented in seconds since epoch (January 1st 1970)
+            'x' should be a 1-dimensional array that represents the data's x axis.  Typically this data is time, represented in seconds since epoch (January 1st 1970).  If the times are not in increasing order, the data is sorted by time.
             
             'y' should be the data values. This can be 2 dimensions if multiple lines or a spectrogram are desired.
             
             'v' is optional, and is only used for spectrogram plots.  This will be a list of bins to be used.  If this is provided, then 'y' should have dimensions of x by z. 
             
-            'x' and 'y' can be any data format that can be read in by the pandas module.  Python lists, numpy arrays, or any pandas data type will all work.   
+            'y' can also have more than 2 dimensions (for example, a particle distribution of time x energy x angle).  The full array is kept, and can be reduced to fewer dimensions with tplot_math.reduce_data.  'v1', 'v2', ... are then the bins of each of the dimensions after time.  The data is plotted summed over the 'v1' dimension, with 'v2' as the bins.  
+            
+            'x' and 'y' can be any data format that can be converted to a numpy array.  Python lists, numpy arrays, or any pandas data type will all work.   
+            
+            This can also be a function that takes no arguments and returns the dictionary above.  See register_lazy.
         delete : bool, optional
             Deletes the tplot variable matching the "name" parameter
         newname: str
             Renames TVar to new name
+        copy : bool, optional
+            By default the input arrays are copied into the tplot variable.  If set to False, 
+            numeric numpy arrays are stored as views of the caller's arrays instead, so no 
+            extra memory is used.  The caller should not modify the arrays afterwards.  
+            Anything else is still copied.  
+        max_samples : int, optional
+            If set, the tplot variable becomes a ring buffer that only keeps this many 
+            of the newest samples.  Older samples are dropped as new ones are added with 
+            append_data, and the memory used stays the same.  
+        max_seconds : float, optional
+            If set, the tplot variable becomes a ring buffer that only keeps the samples 
+            within this many seconds of the newest one.  The times should be added 
+            in increasing order.  
+        precision : str, optional
+            The data is kept in the type it is given in, so for example uint16 counts 
+            stay uint16.  If set to 'float32' or 'float64', floating point 'y' and 'v' 
+            data is converted to that type instead.  'float32' takes half the memory.  
+            The times are never converted.  Defaults to the "precision" set with 
+            tplot_options.  
         
     .. note::
         If you want to combine multiple tplot variables into one, simply supply the list of tplot variables to the "data" parameter.  This will cause the data to overlay when plotted. 
@@ -65,6 +90,24 @@ def store_data(name, data=None, delete=False, newname=None):
         >>> # Combine two different line plots
         >>> pytplot.store_data("Variable1and2", data=['Variable1', 'Variable2'])
         
+        >>> # Store a large array without copying it
+        >>> import numpy as np
+        >>> x_data = np.arange(1000000, dtype=np.float64)
+        >>> y_data = np.random.rand(1000000, 3)
+        >>> pytplot.store_data("Variable4", data={'x':x_data, 'y':y_data}, copy=False)
+        
+        >>> # Keep only the last 10 minutes of data, for a live display
+        >>> pytplot.store_data("Variable5", data={'x':[0], 'y':[0]}, max_seconds=600)
+        >>> pytplot.append_data("Variable5", 1, 5)
+        
+        >>> # Keep a large spectrogram in single precision
+        >>> y_data = np.random.rand(100000, 64)
+        >>> pytplot.store_data("Variable6", data={'x':np.arange(100000), 'y':y_data, 'v':np.arange(64)}, precision='float32')
+        
+        >>> # Store a distribution of 32 energies by 16 angles
+        >>> y_data = np.random.rand(1000, 32, 16)
+        >>> pytplot.store_data("Variable7", data={'x':np.arange(1000), 'y':y_data, 'v1':np.logspace(0, 4, 32), 'v2':np.linspace(0, 180, 16)})
+        
         >>> #Rename TVar
         >>> pytplot.store_data('a', data={'x':[0,4,8,12,16], 'y':[1,2,3,4,5]})
         >>> pytplot.store_data('a',newname='f')
@@ -86,44 +129,35 @@ def store_data(name, data=None, delete=False, newname=None):
         pytplot.tplot_rename(name,newname)
         return
     
-    if isinstance(data, list):
+    if precision is None:
+        precision = pytplot.tplot_opt_glob.get('precision')
+    if not valid_precision(precision):
+        return
+    
+    loader = None
+    if callable(data):
+        #Lazy variable, the loader is not called until the data is used
+        loader = data
+        tvar_data = None
+        spec_bins = None
+        trange = None
+    elif isinstance(data, list):
         base_data = get_base_tplot_vars(data)
         #Use first tplot var as the time range
-        trange = [np.nanmin(data_quants[base_data[0]].data.index), 
-                  np.nanmax(data_quants[base_data[0]].data.index)]
-        df = base_data
+        trange = [np.nanmin(data_quants[base_data[0]].times), 
+                  np.nanmax(data_quants[base_data[0]].times)]
+        tvar_data = base_data
         spec_bins=None
-    else:             
-        df = format_ydata(data['y'])            
-        times = data['x']
-        if len(times) != len(df.index):
-            print("The lengths of x and y do not match!")
+    else:
+        formatted_data = format_data(data, copy=copy, precision=precision)
+        if formatted_data is None:
             return
-        elif isinstance(times, pd.Series):
-            df = df.set_index(data['x'])
-        else:
-            df['Index'] = times
-            df = df.set_index('Index', drop=True)
+        times, values, spec_bins, nd_values, nd_axes = formatted_data
         trange = [np.nanmin(times), np.nanmax(times)]
-        
-        if 'v' in data or 'v2' in data:
-            #Generally the data is 1D, but occasionally
-            #the bins will vary in time.  
-            if 'v' in data:
-                spec_bins = data['v']
-            else:
-                spec_bins = data['v2']
-            spec_bins=pd.DataFrame(spec_bins)
-            if len(spec_bins.columns) != 1:
-                if len(spec_bins) == len(df.index):
-                    spec_bins = spec_bins.set_index(df.index)  
-                else:
-                    print("Length of v and x do not match.  Cannot create tplot variable.")
-                    return 
-            else:
-                spec_bins = spec_bins.transpose()         
-        else:
-            spec_bins = None
+        tvar_data = (times, values)
+        if nd_values is not None and (max_samples is not None or max_seconds is not None):
+            print("Data with more than 2 dimensions cannot be kept in a ring buffer.")
+            return
         
         
     yaxis_opt = dict(axis_label = name)
@@ -135,80 +169,153 @@ def store_data(name, data=None, delete=False, newname=None):
     #     that aren't actual attributes in Bokeh
     extras = dict(panel_size = 1)
     links = {}
-    temp = TVar(name, tplot_num, df, spec_bins, yaxis_opt, zaxis_opt, line_opt,
-                trange, dtype, create_time, time_bar, extras, links)
+    temp = TVar(name, tplot_num, tvar_data, spec_bins, yaxis_opt, zaxis_opt, line_opt,
+                trange, dtype, create_time, time_bar, extras, links, loader=loader, 
+                precision=precision)
     
+    if tvar_data is not None and not isinstance(data, list):
+        #format_data put the times in order
+        temp._times_sorted = True
+        temp.nd_values = nd_values
+        temp.nd_axes = nd_axes
+    if not isinstance(data, list):
+        temp.max_samples = max_samples
+        temp.max_seconds = max_seconds
+        if temp.is_ring_buffer and loader is None:
+            #Appending nothing sets up the ring buffer and drops the samples 
+            #past the limits
+            if temp.spec_bins_time_varying:
+                temp.append(temp.times[:0], temp.values[:0], temp.spec_bins[:0])
+            else:
+                temp.append(temp.times[:0], temp.values[:0])
+    if loader is None:
+        temp.yaxis_opt['y_range'] = get_y_range(temp)
+    
+    #Only stored once it is complete, since other threads may be reading data_quants
     data_quants[name] = temp
-    data_quants[name].yaxis_opt['y_range'] = get_y_range(df, spec_bins)
+    if loader is None:
+        enforce_memory_budget()
     
     return
 
+def format_data(data, copy=True, precision=None):
+    #Turns the data dictionary given to store_data into the time, value and 
+    #spec_bins arrays of a TVar, and for data with more than 2 dimensions, the 
+    #full array and the bins of each of its dimensions.  Returns None if the 
+    #data is not valid.
+    matrix = apply_precision(_to_array(data['y'], copy=copy), precision)
+    values = format_ydata(matrix, copy=False)
+    times = _to_array(data['x'], copy=copy)
+    if times.ndim != 1:
+        print("x must be 1 dimensional!")
+        return
+    if len(times) != len(values):
+        print("The lengths of x and y do not match!")
+        return
+    
+    nd_values = None
+    nd_axes = None
+    if matrix.ndim > 2:
+        nd_values = matrix
+        nd_axes = []
+        for dimension in range(1, matrix.ndim):
+            axis = data.get('v' + str(dimension))
+            if axis is not None:
+                axis = apply_precision(_to_array(axis, copy=copy), precision)
+                if axis.shape != (matrix.shape[dimension],) and axis.shape != (len(times), matrix.shape[dimension]):
+                    print("The size of v" + str(dimension) + " does not match y.  Cannot create tplot variable.")
+                    return
+            nd_axes.append(axis)
+    
+    if 'v' in data or 'v2' in data:
+        #Generally the data is 1D, but occasionally
+        #the bins will vary in time.  
+        if 'v' in data:
+            spec_bins = data['v']
+        else:
+            spec_bins = data['v2']
+        spec_bins = apply_precision(_to_array(spec_bins, copy=copy), precision)
+        if spec_bins.ndim == 1:
+            spec_bins = spec_bins[np.newaxis, :]
+        elif spec_bins.shape[1] == 1:
+            spec_bins = spec_bins.transpose()
+        elif len(spec_bins) != len(times):
+            print("Length of v and x do not match.  Cannot create tplot variable.")
+            return 
+    else:
+        spec_bins = None
+    
+    if len(times) > 1 and not np.all(times[1:] >= times[:-1]):
+        #Sort once here, so everything after can binary search the times
+        order = np.argsort(times, kind='stable')
+        times = times[order]
+        values = values[order]
+        if spec_bins is not None and len(spec_bins) == len(times):
+            spec_bins = spec_bins[order]
+        if nd_values is not None:
+            nd_values = nd_values[order]
+            nd_axes = [axis[order] if axis is not None and axis.ndim == 2 else axis 
+                       for axis in nd_axes]
+    return times, values, spec_bins, nd_values, nd_axes
+
 def get_base_tplot_vars(data):
     base_vars = []
     if not isinstance(data, list):
         data = [data]
     for var in data:
-        if isinstance(data_quants[var].data, list):
-            base_vars += get_base_tplot_vars(data_quants[var].data)
-        else:
-            base_vars += [var]
+        #data_quants keeps the base variables of every combined variable
+        base_vars += data_quants.base_names(var)
     return base_vars
 
-def get_y_range(data, spec_bins):
-    #This is for the numpy RuntimeWarning: All-NaN axis encountered
-    #with np.nanmin below
-    import warnings
-    warnings.filterwarnings("error")
-    ###
-    if spec_bins is not None:
-        ymin = np.nanmin(spec_bins)
-        ymax = np.nanmax(spec_bins)
-        return [ymin, ymax]
+def get_y_range(tvar):
+    #The statistics are computed here, once, in a single pass over the data.
+    #Everything else that needs the range of the data reads them from the TVar.
+    if tvar.spec_bins is not None:
+        return [tvar.spec_bins_stats.min, tvar.spec_bins_stats.max]
+    
+    datasets = []
+    if tvar.overlay is not None:
+        for oplot_name in tvar.overlay:
+            datasets.append(data_quants[oplot_name])
     else:
-        datasets = []
-        y_min_list = []
-        y_max_list = []
-        if isinstance(data, list):
-            for oplot_name in data:
-                datasets.append(data_quants[oplot_name].data)
-        else:
-            datasets.append(data)
-    
-        for dataset in datasets:
-            dataset_temp = dataset.replace([np.inf, -np.inf], np.nan)
-            try:
-                y_min_list.append(np.nanmin(dataset_temp.min(skipna=True).tolist()))
-                y_max_list.append(np.nanmax(dataset_temp.max(skipna=True).tolist()))
-            except RuntimeWarning:
-                y_min_list.append(np.nan)
-                y_max_list.append(np.nan)
-        
-        y_min = min(y_min_list)
-        y_max = max(y_max_list)
-        
-        if y_min==y_max:
-            #Show 10% and 10% below the straight line
-            y_min = y_min-(.1*np.abs(y_min))
-            y_max = y_max+(.1*np.abs(y_max))
-        warnings.resetwarnings()
-        return [y_min, y_max]
-    
-def format_ydata(data):
+        datasets.append(tvar)
+    
+    datasets = [dataset for dataset in datasets if dataset.stats.finite_count != 0]
+    if len(datasets) == 0:
+        return [np.nan, np.nan]
+    y_min = min([dataset.stats.min for dataset in datasets])
+    y_max = max([dataset.stats.max for dataset in datasets])
+    
+    if y_min==y_max:
+        #Show 10% and 10% below the straight line
+        y_min = y_min-(.1*np.abs(y_min))
+        y_max = y_max+(.1*np.abs(y_max))
+    return [y_min, y_max]
+    
+def _to_array(data, copy=True):
+    #Returns data as a numpy array.  If copy is False, numeric numpy arrays 
+    #are adopted as they are instead of being copied
+    if not copy:
+        matrix = np.asarray(data)
+        if matrix.dtype.kind in 'biuf':
+            return matrix
+    return np.array(data)
+
+def format_ydata(data, copy=True):
     #This function is not final, and will presumably change in the future
     #
-    #For 2D data, turn it into a Pandas dataframe
-    #For 3D data, Sum over the second dimension, then turn into a Pandas dataframe
+    #For 2D data, keep it as a 2D numpy array
+    #For 1D data, turn it into a single column (a view, not a copy)
+    #For 3D data, Sum over the second dimension
     #For 4D data, ignore the last dimension
+    #(format_data keeps the full array of 3D and 4D data, see TVar.reduce)
     
-    if data is not pd.DataFrame:
-        matrix = np.array(data)
-        if len(matrix.shape) > 2:
-            matrix = np.nansum(matrix, 1)
-        if len(matrix.shape) > 2:
-            matrix = matrix[:,:,0]
-            
-    else:
-        return data
+    matrix = _to_array(data, copy=copy)
+    if len(matrix.shape) > 2:
+        matrix = np.nansum(matrix, 1)
+    if len(matrix.shape) > 2:
+        matrix = matrix[:,:,0]
+    if len(matrix.shape) == 1:
+        matrix = matrix.reshape(-1, 1)
     
-    return_data = pd.DataFrame(matrix)
-    return return_data
\ No newline at end of file
+    return matrix
@@ -0,0 +1,74 @@
+# Copyright 2018 Regents of the University of Colorado. All Rights Reserved.
+# Released under the MIT license.
+# This software was developed at the University of Colorado's Laboratory for Atmospheric and Space Physics.
+# Verify current version before use at: https://github.com/MAVENSDC/PyTplot
+
+import numbers
+from pytplot import data_quants
+from . import tplot_utilities
+from .store_data import store_data
+
+def time_clip(name, min_time, max_time, newname=None):
+    """
+    This function gets the data of a tplot variable between two times.  The times of 
+    a tplot variable are kept in order, so the start and end are found with a binary 
+    search, and the arrays returned are views of the stored data rather than copies.  
+    
+    Parameters:
+        name : str 
+            Name of the tplot variable
+        min_time : flt
+            The start time.  Can be given in seconds since epoch, or as a string
+            in the format "YYYY-MM-DD HH:MM:SS"
+        max_time : flt
+            The end time.  Can be given in seconds since epoch, or as a string
+            in the format "YYYY-MM-DD HH:MM:SS"
+        newname : str, optional
+            If given, the clipped data is also stored as a new tplot variable with this name.  
+         
+    Returns:
+        time_val : numpy array
+            The times of the data between min_time and max_time (inclusive)
+        data_val : numpy array
+            The data values at those times
+            
+    Examples:
+        >>> # Get the data from the first 2 seconds of Variable1
+        >>> import pytplot
+        >>> x_data = [1,2,3,4,5]
+        >>> y_data = [1,2,3,4,5]
+        >>> pytplot.store_data("Variable1", data={'x':x_data, 'y':y_data})
+        >>> time, data = pytplot.time_clip("Variable1", 1, 2)
+        
+        >>> # Store one day of data as a new variable
+        >>> pytplot.time_clip("Variable1", "2017-07-17 00:00:00", "2017-07-18 00:00:00", newname="Variable1_day")
+
+    """
+    
+    if name not in data_quants.keys():
+        print("That name is currently not in pytplot")
+        return
+    if data_quants[name].overlay is not None:
+        print("Cannot clip a combination of tplot variables.")
+        return
+    #numbers.Number includes numpy scalars, like np.int64 and np.float32
+    if not isinstance(min_time, numbers.Number):
+        min_time = tplot_utilities.str_to_int(min_time)
+    if not isinstance(max_time, numbers.Number):
+        max_time = tplot_utilities.str_to_int(max_time)
+    
+    temp_data_quant = data_quants[name]
+    first, last = temp_data_quant.time_indices(min_time, max_time)
+    time_val = temp_data_quant.times[first:last]
+    data_val = temp_data_quant.values[first:last]
+    
+    if newname is not None:
+        data = {'x':time_val, 'y':data_val}
+        spec_bins = temp_data_quant.spec_bins
+        if spec_bins is not None:
+            if temp_data_quant.spec_bins_time_varying:
+                spec_bins = spec_bins[first:last]
+            data['v'] = spec_bins
+        store_data(newname, data=data)
+    
+    return(time_val, data_val)
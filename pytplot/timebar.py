@@ -20,6 +20,7 @@ def timebar(t, varname = None, databar = False, delete = False, color = 'black',
             place a horizontal bar.  
         varname : str/list, optional
             The variable(s) to add the vertical bar to.  If not set, the default is to add it to all current plots.  
+            The wildcards "*" and "?" can be used.  
         databar : bool, optional
             This will turn the timebar into a horizontal data bar.  If this is set True, then variable "t" becomes 
             the point on the y axis to place a horizontal bar.  
@@ -91,8 +92,7 @@ def timebar(t, varname = None, databar = False, delete = False, color = 'black',
                 temp_data_quants.time_bar.append(tbar)
     #if varname specified
     else:
-        if not isinstance(varname, list):
-            varname = [varname]
+        varname = data_quants.select(varname)
         for j in varname:
             if j not in data_quants.keys():
                 print(str(j) + "is currently not in pytplot")
@@ -121,6 +121,8 @@ def tplot(name,
         if name[i] not in pytplot.data_quants.keys():
             print(str(i) + " is currently not in pytplot")
             return
+        #Read in lazy variables before the plots look at their ranges
+        pytplot.data_quants[name[i]].load()
     
     if isinstance(var_label, int):
         var_label = list(pytplot.data_quants.keys())[var_label]
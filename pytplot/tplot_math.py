@@ -18,15 +18,27 @@
 #         mult_data               multiply TVar1/2 data
 #         spec_mult               multiply TVar data by spec_bin values
 #         div_data                divide TVar1/2 data, NaN for division by 0
-#         deriv_data              take derivative w.r.t. of TVar data
+#         evaluate                evaluate an expression of TVars, like '(a - b) / sqrt(c)'
+#         deriv_data              take derivative w.r.t. time of TVar data (forward, central or gradient)
 #         flatten_data            divide each data column by column average over specified time
 #         full_flatten            divide each data column by column average
-#         avg_res_data            take average of rows at resolution per column
+#         sliding_flatten         divide each data column by column average over a sliding window of time
+#         avg_res_data            take average (or median, min, max, std, count, sum) of rows in bins of width res per column
+#         reduce_data             sum, average or slice one dimension of data with more than 2 dimensions
 #         interp_gap              interpolate through NaN data
-#         fn_interp               linear interpolation, subfunction called in add/sub/mult/div
+#         fn_interp               interpolate TVar2 to TVar1 times (kept in memory for reuse), subfunction called in add/sub/mult/div
 #         crop_data               shortens arrays to same timespan, subfunction called in fn_interp
 #         ============            =====
 #     
+#     The functions that interpolate one TVar to the times of another 
+#     (add/sub/mult/div_data and evaluate) take interp='linear', 'cubic' or 
+#     'quad_spline', and workers=N to interpolate groups of columns in N 
+#     processes at the same time (cubic and quad_spline only).  
+#     
+#     The new TVars remember how they were made.  If any of the TVars they were 
+#     made from change afterwards (for example, they are stored again or data 
+#     is appended), the new TVar is computed again the next time it is used.  
+#     
 #     Returns:
 #         new_tvar
 #     
@@ -39,226 +51,442 @@
 #         >>> pytplot.tplot_math.deriv_data('b','dbdt')
 #         >>> pytplot.tplot_math.spec_mult('diff_en_fluxes','flux_spec_mult')
 #         >>> pytplot.tplot_math.flatten_data('sc_lon',1497830400,1497830528)
+#         >>> pytplot.tplot_math.sliding_flatten('sc_lon',600,'sc_lon_flat')
 #         >>> pytplot.tplot_math.add_data('c','d','c+d',interp='cubic')
+#         >>> pytplot.tplot_math.evaluate('c_d_ratio','(c - d) / sqrt(abs(d))')
+#         >>> pytplot.tplot_math.avg_res_data('d',5,'d_5s',method='median')
+#         >>> pytplot.tplot_math.reduce_data('dist','energy_spec',method='sum',axis=2)
 # 
 # """
 
+import ast
+import sys
 import pytplot
-import pydivide
+from pytplot import tplot_utilities
 import numpy as np
-from scipy import interpolate
-from scipy.interpolate import interp1d
+from pytplot.align_data import align_tvar, interp_methods
+from pytplot.bin_data import bin_values, bin_methods
 import pandas as pd
 
 
+#STORE DERIVED TVAR
+#store the data dictionary made by compute in new_tvar, and keep compute so
+#that new_tvar is made again when any of the inputs change
+def _store_derived(new_tvar,compute,inputs):
+    #results keep the precision of the inputs, if they all have the same one
+    precisions = set(pytplot.data_quants[name].precision for name in inputs)
+    precision = precisions.pop() if len(precisions) == 1 else None
+    data = compute()
+    if data is None:
+        return
+    pytplot.store_data(new_tvar,data=data, copy=False, precision=precision)
+    if new_tvar not in pytplot.data_quants:
+        return
+    #no recipe is kept if the results are stored over an input, or anything
+    #the inputs are made from (see TVar.set_recipe)
+    pytplot.data_quants[new_tvar].set_recipe(compute,inputs)
+
 #ADD TWO ARRAYS
 #add two tvar data arrays, store in new_tvar
-def add_data(tvar1,tvar2,new_tvar,interp='linear'):
-    #interpolate tvars
-    tv1,tv2 = fn_interp(tvar1,tvar2,interp=interp)
-    #separate and add data
-    time = pytplot.data_quants[tv1].data.index
-    data1 = pytplot.data_quants[tv1].data
-    data2 = pytplot.data_quants[tv2].data
-    data = data1+data2
-    #store added data
-    pytplot.store_data(new_tvar,data={'x':time, 'y':data})
+def add_data(tvar1,tvar2,new_tvar,interp='linear',workers=None):
+    if not _valid_interp(interp):
+        return
+    def compute():
+        #interpolate tvars
+        time,data1,data2 = fn_interp(tvar1,tvar2,interp=interp,workers=workers)
+        #add data
+        data = data1+data2
+        #return added data
+        return {'x':time, 'y':data}
+    _store_derived(new_tvar,compute,[tvar1,tvar2])
     return new_tvar
 
 #ADD ACROSS COLUMNS
 #add tvar data across columns, store in new_tvar
 def add_data_across(tvar1,new_tvar):
-    #separate and add data
-    time = pytplot.data_quants[tvar1].data.index
-    data1 = pytplot.data_quants[tvar1].data
-    data = data1.sum(axis=1)
-    #store added data
-    pytplot.store_data(new_tvar,data={'x':time, 'y':data})
+    def compute():
+        #separate and add data
+        time = pytplot.data_quants[tvar1].times
+        data1 = pytplot.data_quants[tvar1].values
+        data = np.nansum(data1, axis=1)
+        #return added data
+        return {'x':time, 'y':data}
+    _store_derived(new_tvar,compute,[tvar1])
     return new_tvar
 
 #PARTIAL ADD ACROSS COLUMNS
 #add tvar data across specific columns, store in new_tvar
 def partial_add_across(tvar1,column_range,new_tvar):
-    #separate and add data
-    time = pytplot.data_quants[tvar1].data.index
-    data1 = pytplot.data_quants[tvar1].data
-    data = []
-    #grab column data
-    for i in column_range:
-        #if not a list
-        if type(i) == int:
-            data = data + [list(data1[i])]
-        #sum across listed column range
-        else:
-            range_start = i[0]
-            range_end = i[1]
-            add_col = list(range(range_start,range_end+1))
-            datasum = data1[add_col].sum(axis=1)
-            data = data + [list(datasum)]
-    #store added data
-    pytplot.store_data(new_tvar,data={'x':time, 'y':np.transpose(data)})
+    def compute():
+        #separate and add data
+        time = pytplot.data_quants[tvar1].times
+        data1 = pytplot.data_quants[tvar1].values
+        data = []
+        #grab column data
+        for i in column_range:
+            #if not a list
+            if type(i) == int:
+                data = data + [data1[:,i]]
+            #sum across listed column range
+            else:
+                range_start = i[0]
+                range_end = i[1]
+                datasum = np.nansum(data1[:,range_start:range_end+1], axis=1)
+                data = data + [datasum]
+        #return added data
+        return {'x':time, 'y':np.column_stack(data)}
+    _store_derived(new_tvar,compute,[tvar1])
     return new_tvar
 
 #SUBTRACT
 #subtract two tvar data arrays, store in new_tvar
-def sub_data(tvar1,tvar2,new_tvar,interp='linear'):
-    #interpolate tvars
-    tv1,tv2 = fn_interp(tvar1,tvar2,interp=interp)
-    #separate and subtract data
-    time = pytplot.data_quants[tv1].data.index
-    data1 = pytplot.data_quants[tv1].data
-    data2 = pytplot.data_quants[tv2].data
-    data = data1 - data2
-    #store subtracted data
-    pytplot.store_data(new_tvar,data={'x':time, 'y':data})
+def sub_data(tvar1,tvar2,new_tvar,interp='linear',workers=None):
+    if not _valid_interp(interp):
+        return
+    def compute():
+        #interpolate tvars
+        time,data1,data2 = fn_interp(tvar1,tvar2,interp=interp,workers=workers)
+        #subtract data
+        data = data1 - data2
+        #return subtracted data
+        return {'x':time, 'y':data}
+    _store_derived(new_tvar,compute,[tvar1,tvar2])
     return new_tvar
 
 #MULTIPLY
 #multiply two tvar data arrays, store in new_tvar
-def mult_data(tvar1,tvar2,new_tvar,interp='linear'):
-    #interpolate tvars
-    tv1,tv2 = fn_interp(tvar1,tvar2,interp=interp)
-    #separate and multiply data
-    time = pytplot.data_quants[tv1].data.index
-    data1 = pytplot.data_quants[tv1].data
-    data2 = pytplot.data_quants[tv2].data
-    data = data1*data2
-    #store multiplied data
-    pytplot.store_data(new_tvar,data={'x':time, 'y':data})
+def mult_data(tvar1,tvar2,new_tvar,interp='linear',workers=None):
+    if not _valid_interp(interp):
+        return
+    def compute():
+        #interpolate tvars
+        time,data1,data2 = fn_interp(tvar1,tvar2,interp=interp,workers=workers)
+        #multiply data
+        data = data1*data2
+        #return multiplied data
+        return {'x':time, 'y':data}
+    _store_derived(new_tvar,compute,[tvar1,tvar2])
     return new_tvar
 
 #SPEC BIN MULTIPLICATION
 #multiply spec_bin values by tvar data, store in new_tvar
 def spec_mult(tvar1,new_tvar):
-    dataframe = pytplot.data_quants[tvar1].data
-    specframe = pytplot.data_quants[tvar1].spec_bins
-    new_df = pd.DataFrame(dataframe.values*specframe.values, columns=dataframe.columns, index=dataframe.index)    
-    pytplot.store_data(new_tvar,data={'x':new_df.index,'y':new_df.values})
+    def compute():
+        time = pytplot.data_quants[tvar1].times
+        data = pytplot.data_quants[tvar1].values
+        spec_bins = pytplot.data_quants[tvar1].spec_bins
+        return {'x':time,'y':data*spec_bins}
+    _store_derived(new_tvar,compute,[tvar1])
     return new_tvar
 
 #DIVIDE
 #divide two tvar data arrays, store in new_tvar
-def div_data(tvar1,tvar2,new_tvar,interp='linear'):
-    #interpolate tvars
-    tv1,tv2 = fn_interp(tvar1,tvar2,interp=interp)
-    #separate and divide data
-    time = pytplot.data_quants[tv1].data.index
-    data1 = pytplot.data_quants[tv1].data
-    data2 = pytplot.data_quants[tv2].data
-    data = data1/data2
-    #if division by 0, replace with NaN
-    data = data.replace([np.inf,-np.inf],np.nan)
-    #store divided data
-    pytplot.store_data(new_tvar,data={'x':time, 'y':data})
+def div_data(tvar1,tvar2,new_tvar,interp='linear',workers=None):
+    if not _valid_interp(interp):
+        return
+    def compute():
+        #interpolate tvars
+        time,data1,data2 = fn_interp(tvar1,tvar2,interp=interp,workers=workers)
+        #divide data
+        with np.errstate(divide='ignore', invalid='ignore'):
+            data = data1/data2
+        #if division by 0, replace with NaN
+        data[np.isinf(data)] = np.nan
+        #return divided data
+        return {'x':time, 'y':data}
+    _store_derived(new_tvar,compute,[tvar1,tvar2])
     return new_tvar
 
+#EVALUATE EXPRESSION
+#evaluate an expression of tvars, like '(a - b) / sqrt(c)', store in new_tvar
+#all of the tvars are interpolated once onto the times of the first one (over
+#the time range they all cover), then the expression is worked out with numpy
+#on the whole arrays, without storing any of the steps as tvars.  names that
+#aren't python identifiers can be quoted, like '"mvn_swe-flux" * 2'.
+#division by 0 gives NaN, like div_data.
+_eval_binary = {ast.Add:np.add, ast.Sub:np.subtract, ast.Mult:np.multiply,
+                ast.Div:np.divide, ast.Pow:np.power}
+_eval_unary = {ast.USub:np.negative, ast.UAdd:np.positive}
+_eval_functions = {'sqrt':np.sqrt, 'abs':np.abs, 'exp':np.exp, 'log':np.log,
+                   'log10':np.log10, 'sin':np.sin, 'cos':np.cos, 'tan':np.tan,
+                   'arcsin':np.arcsin, 'arccos':np.arccos, 'arctan':np.arctan,
+                   'arctan2':np.arctan2, 'minimum':np.fmin, 'maximum':np.fmax}
+_eval_constants = {'pi':np.pi, 'e':np.e}
+#numbers and quoted names.  before python 3.8 they aren't ast.Constant.
+if sys.version_info < (3, 8):
+    _eval_literals = (ast.Constant, ast.Num, ast.Str)
+else:
+    _eval_literals = (ast.Constant,)
+
+def evaluate(new_tvar,expression,interp='linear',workers=None):
+    try:
+        tree = ast.parse(expression, mode='eval').body
+        names = _expression_tvars(tree)
+    except (SyntaxError, ValueError) as err:
+        print('Cannot evaluate ' + repr(expression) + ': ' + str(err))
+        return
+    if not names:
+        print('The expression does not use any tplot variables.')
+        return
+    for name in names:
+        if name not in pytplot.data_quants:
+            print(str(name) + " is currently not in pytplot.")
+            return
+        if pytplot.data_quants[name].overlay is not None:
+            print("Cannot evaluate a combination of tplot variables.")
+            return
+    if not _valid_interp(interp):
+        return
+    if _common_time_range(names) is None:
+        print('The tplot variables in the expression do not overlap in time.')
+        return
+    def compute():
+        #the inputs may have been stored again since, so the overlap is found
+        #each time.  returning None leaves the data as it is.
+        time_range = _common_time_range(names)
+        if time_range is None:
+            print('The tplot variables in ' + repr(expression) + ' no longer overlap in time.')
+            return
+        cut1,cut2 = time_range
+        #times of the first tvar, over the time range all of them cover
+        time,_ = pytplot.data_quants[names[0]].time_slice(cut1,cut2)
+        arrays = {}
+        for name in names:
+            tv_t,tv_d = pytplot.data_quants[name].time_slice(cut1,cut2)
+            if len(tv_t) == len(time) and np.array_equal(tv_t,time):
+                #integers are made floats, like the interpolated values, so 
+                #unsigned values don't wrap around
+                arrays[name] = tv_d.astype(tplot_utilities.float_dtype(tv_d), copy=False)
+            else:
+                arrays[name] = align_tvar(name,time,method=interp,workers=workers)
+                if arrays[name] is None:
+                    return
+        with np.errstate(divide='ignore', invalid='ignore'):
+            data = _evaluate_node(tree,arrays)
+        data = np.asarray(data)
+        if data.ndim == 0:
+            data = np.full(len(time),data)
+        return {'x':time,'y':data}
+    _store_derived(new_tvar,compute,names)
+    return new_tvar
+
+def _common_time_range(names):
+    #the first and last times covered by all of the tvars, or None if they don't overlap
+    cut1 = max(pytplot.data_quants[name].times[0] for name in names)
+    cut2 = min(pytplot.data_quants[name].times[-1] for name in names)
+    if cut1 > cut2:
+        return None
+    return cut1,cut2
+
+def _expression_tvars(node):
+    #names of the tvars in an expression, in the order they first appear.
+    #raises ValueError for anything that isn't allowed.
+    names = []
+    functions = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Call):
+            if (not isinstance(child.func, ast.Name) or child.func.id not in _eval_functions
+                    or child.keywords):
+                raise ValueError('only the functions ' + ', '.join(_eval_functions) + ' can be used')
+            functions.add(child.func)
+        elif isinstance(child, ast.BinOp):
+            if type(child.op) not in _eval_binary:
+                raise ValueError('only +, -, *, / and ** can be used')
+        elif isinstance(child, ast.UnaryOp):
+            if type(child.op) not in _eval_unary:
+                raise ValueError('only + and - can be used in front of a value')
+        elif isinstance(child, _eval_literals):
+            value = _literal_value(child)
+            if isinstance(value, str):
+                name = value
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                continue
+            else:
+                raise ValueError(repr(value) + ' is not a number or a name')
+            if name not in names:
+                names.append(name)
+        elif isinstance(child, ast.Name):
+            if child in functions:
+                continue
+            if child.id in _eval_constants and child.id not in pytplot.data_quants:
+                continue
+            if child.id not in names:
+                names.append(child.id)
+        elif not isinstance(child, (ast.Load, ast.operator, ast.unaryop)):
+            raise ValueError(type(child).__name__ + ' is not allowed')
+    return names
+
+def _evaluate_node(node,arrays):
+    if isinstance(node, ast.BinOp):
+        left = _evaluate_node(node.left,arrays)
+        right = _evaluate_node(node.right,arrays)
+        result = _eval_binary[type(node.op)](left,right)
+        if isinstance(node.op, ast.Div):
+            #if division by 0, replace with NaN
+            result = np.where(np.isinf(result), np.nan, result)
+        return result
+    if isinstance(node, ast.UnaryOp):
+        return _eval_unary[type(node.op)](_evaluate_node(node.operand,arrays))
+    if isinstance(node, ast.Call):
+        return _eval_functions[node.func.id](*[_evaluate_node(arg,arrays) for arg in node.args])
+    if isinstance(node, _eval_literals):
+        value = _literal_value(node)
+        if isinstance(value, str):
+            return arrays[value]
+        return value
+    if node.id in arrays:
+        return arrays[node.id]
+    return _eval_constants[node.id]
+
+def _literal_value(node):
+    if isinstance(node, ast.Constant):
+        return node.value
+    #ast.Num or ast.Str, before python 3.8
+    return node.n if isinstance(node, ast.Num) else node.s
+
 #DERIVE
 #take derivative w.r.t. time, store in new_tvar
-def deriv_data(tvar1,new_tvar):
-    #separate and derive data
-    time = pytplot.data_quants[tvar1].data.index
-    data1 = pytplot.data_quants[tvar1].data
-    df_index = pytplot.data_quants[tvar1].data.columns
-    new_df = []
-    for i in df_index:
-        tv1_col = data1[i]
-        data = np.diff(tv1_col)/np.diff(time)
-        new_df = new_df + [data]
-    new_df = np.transpose((list(new_df)))
-    time = np.delete(time,0)
-    #store differentiated data
-    pytplot.store_data(new_tvar,data={'x':time, 'y':new_df})
+#method is one of:
+#   forward     (y[i+1]-y[i])/(t[i+1]-t[i]), at the times t[1:], so one sample is dropped
+#   central     (y[i+1]-y[i-1])/(t[i+1]-t[i-1]), one sided at the ends, keeps the times
+#   gradient    np.gradient with the times, second order accurate even when the cadence changes, keeps the times
+_deriv_methods = ['forward', 'central', 'gradient']
+
+def deriv_data(tvar1,new_tvar,method='forward'):
+    if method not in _deriv_methods:
+        print('Error: choose derivative method.')
+        print(', '.join(_deriv_methods))
+        return
+    if len(pytplot.data_quants[tvar1].times) < 2:
+        raise ValueError('At least 2 samples are needed to take the derivative of ' + tvar1)
+    def compute():
+        #separate and derive data, all columns at once.  integers are made 
+        #floats first, so unsigned values going down don't wrap around.  
+        time = pytplot.data_quants[tvar1].times
+        data1 = pytplot.data_quants[tvar1].values
+        if len(time) < 2:
+            print('At least 2 samples are needed to take the derivative of ' + tvar1)
+            return
+        dtype = tplot_utilities.float_dtype(data1)
+        data1 = data1.astype(dtype, copy=False)
+        time = np.asarray(time, dtype=np.float64)
+        if method == 'forward':
+            new_df = np.diff(data1, axis=0)/np.diff(time)[:,np.newaxis]
+            time = time[1:]
+        elif method == 'central':
+            new_df = np.empty(data1.shape, dtype=dtype)
+            new_df[1:-1] = (data1[2:]-data1[:-2])/(time[2:]-time[:-2])[:,np.newaxis]
+            new_df[0] = (data1[1]-data1[0])/(time[1]-time[0])
+            new_df[-1] = (data1[-1]-data1[-2])/(time[-1]-time[-2])
+        else:
+            new_df = np.gradient(data1, time, axis=0)
+        #return differentiated data
+        return {'x':time, 'y':new_df.astype(dtype, copy=False)}
+    _store_derived(new_tvar,compute,[tvar1])
     return new_tvar
 
 #PARTIAL FLATTEN
 #take average of each column of data, divide column by average over specified time
+#the averages come from running totals kept by the tvar (see TVar.window_mean), so
+#flattening the same tvar by many different times doesn't add up the data again
 def flatten_data(tvar1,start_t,end_t,new_tvar):
-    df = pytplot.data_quants[tvar1].data
-    time = df.index
-    #if time given not an index, choose closest time
-    if start_t not in time:
-        tdiff = abs(time - start_t)
-        start_t = time[tdiff.argmin()]
-    if end_t not in time:
-        tdiff = abs(time - end_t)
-        end_t = time[tdiff.argmin()]
-    df_index = list(df.columns)
-    #divide by specified time average
-    for i in df_index:
-        df[i] = df[i]/((df.loc[start_t:end_t])[i]).mean()
-    pytplot.store_data(new_tvar,data = {'x':df.index,'y':df})
+    def compute():
+        tv1 = pytplot.data_quants[tvar1]
+        #if time given not an index, choose closest time
+        start_index = tv1.nearest_index(start_t)
+        end_index = tv1.nearest_index(end_t)
+        #divide by specified time average
+        data = _flatten(tv1.values,tv1._index_window_mean(start_index,end_index+1))
+        return {'x':tv1.times,'y':data}
+    _store_derived(new_tvar,compute,[tvar1])
     return new_tvar
 
 #FULL FLATTEN
 #take average of each column of data, divide column by column average
 def full_flatten(tvar1,new_tvar):
-    df = pytplot.data_quants[tvar1].data
-    df_index = list(df.columns)
-    #divide by column average
-    for i in df_index:
-        df[i] = df[i]/df[i].mean()
-    pytplot.store_data(new_tvar,data = {'x':df.index,'y':df})
+    def compute():
+        tv1 = pytplot.data_quants[tvar1]
+        #divide by column average
+        data = _flatten(tv1.values,tv1._index_window_mean(0,len(tv1.times)))
+        return {'x':tv1.times,'y':data}
+    _store_derived(new_tvar,compute,[tvar1])
+    return new_tvar
+
+#SLIDING FLATTEN
+#divide each sample by the average of each column over the samples within width/2 seconds of it
+def sliding_flatten(tvar1,width,new_tvar):
+    def compute():
+        tv1 = pytplot.data_quants[tvar1]
+        time = tv1.times
+        #every window at once
+        data = _flatten(tv1.values,tv1.window_mean(time-width/2,time+width/2))
+        return {'x':time,'y':data}
+    _store_derived(new_tvar,compute,[tvar1])
     return new_tvar
 
+#divide data by averages, keeping the precision of the data
+def _flatten(data,averages):
+    return data/averages.astype(tplot_utilities.float_dtype(data),copy=False)
+
 #AVERAGE AT RESOLUTION
 #take average of column over discrete periods of time
-def avg_res_data(tvar1,res,new_tvar):
-    #grab info from tvar
-    df = pytplot.data_quants[tvar1].data
-    time = df.index
-    start_t = df.index[0]
-    end_t = df.index[-1]
-    df_index = list(df.columns)
-    #create list of times spanning tvar range @ specified res
-    res_time = np.arange(start_t,end_t+1,res)
-    new_res_time = np.array([])
-    #find closest time to new resolution times
-    for t in res_time:
-        if t not in time:
-            tdiff = abs(time-t)
-            new_res_time = np.append(new_res_time,time[tdiff.argmin()])
-        else:
-            new_res_time = np.append(new_res_time,t)
-    #make sure no duplicate times from resolution time rounding
-    new_res_time = np.unique(new_res_time)
-    #shift start time array
-    start_t = np.roll(new_res_time,1)
-    end_t = new_res_time
-    start_t = np.delete(start_t,0)
-    end_t = np.delete(end_t,0)
-    #initialize arrays
-    avg_bin_data = []
-    avg_bin_time = np.array([])
-    #for each time bin
-    for it,t in enumerate(start_t):
-        #for each data column
-        data_avg_bin = np.array([])
-        for i in df_index:
-            #append localized bin average to data_avg_bin
-            data_avg_bin = np.append(data_avg_bin,[(df.loc[start_t[it]:end_t[it]])[i].mean()])
-        #append whole array of bin averages (over n columns) to avg_bin_data
-        avg_bin_data = avg_bin_data + [data_avg_bin.tolist()]
-        avg_bin_time = np.append(avg_bin_time,t)
-    #store data in new_tvar
-    pytplot.store_data(new_tvar, data={'x':avg_bin_time,'y':avg_bin_data})
-    return new_tvar    
+#method can also be median, min, max, std, count or sum (see bin_data.bin_values)
+def avg_res_data(tvar1,res,new_tvar,method='mean'):
+    if method not in bin_methods:
+        print('Error: choose binning method.')
+        print(', '.join(bin_methods))
+        return
+    if not res > 0:
+        print('The resolution must be greater than 0.')
+        return
+    def compute():
+        #grab info from tvar
+        time = pytplot.data_quants[tvar1].times
+        data = pytplot.data_quants[tvar1].values
+        #reduce each bin of width res, starting from the first time
+        bin_time,bin_data = bin_values(time,data,res,method=method)
+        return {'x':bin_time,'y':bin_data}
+    _store_derived(new_tvar,compute,[tvar1])
+    return new_tvar
     
+#REDUCE DIMENSION
+#sum, average or slice one dimension of tvar1 (see TVar.reduce), store in new_tvar
+#for example, a time x energy x angle distribution summed over axis=2 gives an energy spectrogram
+def reduce_data(tvar1,new_tvar,method='sum',axis=1,index=None):
+    if pytplot.data_quants[tvar1].reduce(method,axis,index) is None:
+        return
+    def compute():
+        tv1 = pytplot.data_quants[tvar1]
+        data = tv1.reduce(method,axis,index)
+        #the bins of the dimensions that are left
+        if tv1.nd_values is not None:
+            axes = list(tv1.nd_axes)
+        else:
+            axes = [tv1.spec_bins]
+        del axes[axis-1]
+        new_data = {'x':tv1.times,'y':data}
+        if data.ndim == 2 and axes[0] is not None:
+            new_data['v'] = axes[0]
+        elif data.ndim > 2:
+            for i,v in enumerate(axes):
+                if v is not None:
+                    new_data['v' + str(i+1)] = v
+        return new_data
+    _store_derived(new_tvar,compute,[tvar1])
+    return new_tvar
+
 #LINEAR INTERPOLATION
 #interpolate over NaN data
 def interp_gap(tvar1):
     tv1 = pytplot.data_quants[tvar1].data
-    tv1 = tv1.astype(float)
+    #interpolation needs floats, float data keeps its precision
+    tv1 = tv1.astype(tplot_utilities.float_dtype(tv1.values))
     tv1 = tv1.interpolate(method='linear')
-    tv1 = tv1.astype(object)
     return tv1
 
 #SPLIT TVAR
 #store columns of TVar into new TVars
 def split_vec(tvar,newtvars,columns):
-    #separate and add data
-    time = pytplot.data_quants[tvar].data.index
-    data = pytplot.data_quants[tvar].data
-    df = pytplot.data_quants[tvar]
     #grab column data
     for i,val in enumerate(columns):
         #if not a list
@@ -268,100 +496,68 @@ def split_vec(tvar,newtvars,columns):
         else:
             range_start = val[0]
             range_end = val[1]
-        split_col = list(range(range_start,range_end+1))
         #store split data
-        pytplot.store_data(newtvars[i],data={'x':time, 'y':data[split_col]})
+        _store_derived(newtvars[i],_split_columns(tvar,range_start,range_end),[tvar])
     return newtvars
 
+def _split_columns(tvar,range_start,range_end):
+    def compute():
+        time = pytplot.data_quants[tvar].times
+        data = pytplot.data_quants[tvar].values
+        #copied, so the new tvar doesn't share memory with tvar
+        return {'x':time.copy(), 'y':data[:,range_start:range_end+1].copy()}
+    return compute
+
 #JOIN TVARS
 #join TVars into single TVar with multiple columns
 def join_vec(tvars,newtvar):
-    df = pytplot.data_quants[tvars[0]].data
-    for i,val in enumerate(tvars):
-        if i == 0:
-            pass
-        else:
-            df = pd.concat([df,pytplot.data_quants[val].data],axis=1)
-    pytplot.store_data(newtvar,data={'x':df.index,'y':df})
+    def compute():
+        time = pytplot.data_quants[tvars[0]].times
+        #if every tvar shares the same times, the columns can be stacked directly
+        if all(np.array_equal(time, pytplot.data_quants[val].times) for val in tvars):
+            data = np.hstack([pytplot.data_quants[val].values for val in tvars])
+            return {'x':time,'y':data}
+        df = pytplot.data_quants[tvars[0]].data
+        for i,val in enumerate(tvars):
+            if i == 0:
+                pass
+            else:
+                df = pd.concat([df,pytplot.data_quants[val].data],axis=1)
+        return {'x':df.index.values,'y':df.values}
+    _store_derived(newtvar,compute,list(tvars))
     return newtvar
 
 #TVAR INTERPOLATION
 #interpolate tvar2 to tvar1 cadence
-def fn_interp(tvar1,tvar2,interp='linear'):
+def fn_interp(tvar1,tvar2,interp='linear',workers=None):
+    if interp not in interp_methods:
+        raise ValueError('interp must be one of ' + ', '.join(interp_methods))
     #crop data
     tv1_t,tv1_d,tv2_t,tv2_d = crop_data(tvar1,tvar2)
-    df_index = pytplot.data_quants[tvar1].data.columns
-    #interpolate to tvar1 cadence
-    if interp == 'linear':
-        print("linear interpolation")
-        name1 = tvar1 + "_interp"
-        name2 = tvar2 + "_interp"
-        new_df = []
-        for i in df_index:
-            tv2_col = [item[i] for item in tv2_d]
-            f = interp1d(tv2_t,tv2_col,fill_value="extrapolate")
-            new_df = new_df + [f(tv1_t)]
-        new_df = np.transpose((list(new_df)))
-        #store interpolated tvars as 'X_interp'
-        pytplot.store_data(name1, data={'x':tv1_t,'y':tv1_d})
-        pytplot.store_data(name2, data={'x':tv1_t,'y':new_df})
-    elif interp == 'cubic':
-        print("cubic interpolation")
-        new_df = []
-        for i in df_index:
-            tv2_col = [item[i] for item in tv2_d]
-            f = interp1d(tv2_t,tv2_col,kind='cubic')
-            new_df = new_df + [f(tv1_t)]
-        new_df = np.transpose((list(new_df)))
-        name1 = tvar1 + "_interp"
-        name2 = tvar2 + "_interp"
-        #store interpolated tvars as 'X_interp'
-        pytplot.store_data(name1, data={'x':tv1_t,'y':tv1_d})
-        pytplot.store_data(name2, data={'x':tv1_t,'y':new_df})
-    elif interp == 'quad_spline':
-        print("quadratic spline interpolation")
-        new_df = []
-        for i in df_index:
-            tv2_col = [item[i] for item in tv2_d]
-            tck = interpolate.splrep(tv2_t, tv2_col, s=0,k=2)
-            ynew = interpolate.splev(tv1_t, tck, der=0)
-            new_df = new_df + [ynew]
-        new_df = np.transpose((list(new_df)))
-        name1 = tvar1 + "_interp"
-        name2 = tvar2 + "_interp"
-        #store interpolated tvars as 'X_interp'
-        pytplot.store_data(name1, data={'x':tv1_t,'y':tv1_d})
-        pytplot.store_data(name2, data={'x':tv1_t,'y':new_df})
-    return name1,name2
+    #interpolate every column of tvar2 to tvar1 cadence at once.  the result
+    #is kept by align_tvar, so using tvar2 with these times again is free.
+    ncols = tv1_d.shape[1]
+    new_df = align_tvar(tvar2, tv1_t, method=interp, workers=workers)[:,:ncols]
+    return tv1_t,tv1_d,new_df
+
+#check the interp method before anything is stored
+def _valid_interp(interp):
+    if interp in interp_methods:
+        return True
+    print('Error: choose interpolation method.')
+    print(', '.join(interp_methods))
+    return False
 
 #DATA CROPPING
 #crop tvar arrays to same timespan
 def crop_data(tvar1,tvar2):
-    #grab time and data arrays
-    tv1_t = np.asarray(pytplot.data_quants[tvar1].data.index.tolist())
-    tv1_d = np.asarray(pytplot.data_quants[tvar1].data)
-    tv2_t = np.asarray(pytplot.data_quants[tvar2].data.index.tolist())
-    tv2_d = np.asarray(pytplot.data_quants[tvar2].data)
-    #find first and last time indices
-    t0_1 = tv1_t[0]
-    t0_2 = tv2_t[0]
-    tx_1 = tv1_t[-1]
-    tx_2 = tv2_t[-1]
-    #find cut locations
-    cut1 = max([t0_1, t0_2])
-    cut2 = min([tx_1, tx_2])
-    #trim data
-    while tv1_t[-1] > cut2:
-        tv1_t = np.delete(tv1_t,-1,axis=0)
-        tv1_d = np.delete(tv1_d,-1,axis=0)
-    while tv1_t[0] < cut1:
-        tv1_t = np.delete(tv1_t,0,axis=0)
-        tv1_d = np.delete(tv1_d,0,axis=0)
-    while tv2_t[-1] > cut2:
-        tv2_t = np.delete(tv2_t,-1,axis=0)
-        tv2_d = np.delete(tv2_d,-1,axis=0)
-    while tv2_t[0] < cut1:
-        tv2_t = np.delete(tv2_t,0,axis=0)
-        tv2_d = np.delete(tv2_d,0,axis=0)
+    tvar1 = pytplot.data_quants[tvar1]
+    tvar2 = pytplot.data_quants[tvar2]
+    #find cut locations, the overlap of the two time ranges
+    cut1 = max(tvar1.times[0], tvar2.times[0])
+    cut2 = min(tvar1.times[-1], tvar2.times[-1])
+    #trim data, these are views of the stored arrays
+    tv1_t,tv1_d = tvar1.time_slice(cut1,cut2)
+    tv2_t,tv2_d = tvar2.time_slice(cut1,cut2)
     #return time and data arrays
     return tv1_t,tv1_d,tv2_t,tv2_d
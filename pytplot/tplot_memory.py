@@ -0,0 +1,150 @@
+# Copyright 2018 Regents of the University of Colorado. All Rights Reserved.
+# Released under the MIT license.
+# This software was developed at the University of Colorado's Laboratory for Atmospheric and Space Physics.
+# Verify current version before use at: https://github.com/MAVENSDC/PyTplot
+
+import numpy as np
+from pytplot import data_quants
+from .memory_budget import array_owner
+
+def tplot_memory(names=None):
+    """
+    This function prints out and returns how much memory each tplot variable
+    is using.  No data is read in or changed to do this, so lazy variables
+    that haven't been used yet show up as using nothing.
+
+    The bytes of each variable are split into:
+
+        ==========  =====
+        times       The times of the data
+        data        The values, including the full array of data with more than 2 dimensions
+        spec_bins   The spec_bins
+        cached      Results kept to save recomputing them, like the reductions of TVar.reduce
+        ==========  =====
+
+    Variables can share memory instead of each having their own copy (for
+    example, the results of tplot_math often use the times of their inputs,
+    and store_data with copy=False uses the arrays it is given).  The "shared"
+    bytes of a variable are the ones that some other variable uses too.  The
+    totals count shared memory only once.  They also count the room kept free
+    at the end of variables that data is appended to.
+
+    Parameters:
+        names : str/list of str, optional
+            The tplot variables to report on.  Wildcards are allowed.  By
+            default, all of them are.
+
+    Returns:
+        dict : A dictionary with
+            "variables", a dictionary of the name of each variable to a dictionary
+            of its "times", "data", "spec_bins", "cached", "total", "shared" and
+            "mapped" bytes, and its "state" ("resident", "memory mapped",
+            "partly memory mapped", "lazy" or "combined").
+
+            "totals", a dictionary of the "total" bytes of all of the variables
+            added up, and the "resident" and "mapped" bytes they really use,
+            with shared memory counted once.
+
+    Examples:
+        >>> # Two variables sharing the same arrays, and a copy
+        >>> import pytplot
+        >>> import numpy as np
+        >>> x = np.arange(1000000)
+        >>> y = np.random.rand(1000000, 3)
+        >>> pytplot.store_data("Variable1", data={'x':x, 'y':y}, copy=False)
+        >>> pytplot.store_data("Variable2", data={'x':x[:500000], 'y':y[:500000]}, copy=False)
+        >>> pytplot.store_data("Variable3", data={'x':x, 'y':y})
+        >>> report = pytplot.tplot_memory()
+        Name           Times       Data  Spec bins     Cached      Total     Shared  State
+        Variable1     7.6 MB    22.9 MB        0 B        0 B    30.5 MB    30.5 MB  resident
+        Variable2     3.8 MB    11.4 MB        0 B        0 B    15.3 MB    15.3 MB  resident
+        Variable3     7.6 MB    22.9 MB        0 B        0 B    30.5 MB        0 B  resident
+        Total                                                    76.3 MB             61.0 MB resident, 0 B memory mapped
+
+    """
+
+    if names is None:
+        names = list(data_quants.keys())
+    else:
+        names = data_quants.select(names)
+
+    #Every array in use belongs to some array that owns its memory.  Knowing
+    #which variables use each owner shows what is shared.
+    users = {}
+    owners = {}
+    for name in data_quants.keys():
+        for _, array in _arrays(data_quants[name]):
+            owner = array_owner(array)
+            owners[id(owner)] = owner
+            users.setdefault(id(owner), set()).add(name)
+
+    variables = {}
+    reported_owners = set()
+    for name in names:
+        if name not in data_quants:
+            print(str(name) + " is currently not in pytplot.")
+            continue
+        tvar = data_quants[name]
+        usage = {'times':0, 'data':0, 'spec_bins':0, 'cached':0, 'shared':0, 'mapped':0}
+        for category, array in _arrays(tvar):
+            usage[category] += array.nbytes
+            owner = array_owner(array)
+            reported_owners.add(id(owner))
+            if len(users[id(owner)]) > 1:
+                usage['shared'] += array.nbytes
+            if isinstance(owner, np.memmap):
+                usage['mapped'] += array.nbytes
+        usage['total'] = usage['times'] + usage['data'] + usage['spec_bins'] + usage['cached']
+        if tvar.overlay is not None:
+            usage['state'] = 'combined'
+        elif tvar.is_lazy:
+            usage['state'] = 'lazy'
+        elif usage['mapped'] == 0:
+            usage['state'] = 'resident'
+        elif usage['mapped'] == usage['total']:
+            usage['state'] = 'memory mapped'
+        else:
+            usage['state'] = 'partly memory mapped'
+        variables[name] = usage
+
+    totals = {'total':sum(usage['total'] for usage in variables.values()),
+              'resident':0, 'mapped':0}
+    for owner_id in reported_owners:
+        owner = owners[owner_id]
+        if isinstance(owner, np.memmap):
+            totals['mapped'] += owner.nbytes
+        else:
+            totals['resident'] += owner.nbytes
+
+    _print_report(variables, totals)
+    return {'variables':variables, 'totals':totals}
+
+def _arrays(tvar):
+    #The (category, array) pairs of a TVar.  The private attributes are used
+    #so that lazy data isn't read in.
+    arrays = [('times', tvar._times), ('data', tvar._values), ('data', tvar._nd_values),
+              ('spec_bins', tvar._spec_bins)]
+    arrays += [('cached', array) for array in tvar._reductions.values()]
+    return [(category, array) for category, array in arrays if isinstance(array, np.ndarray)]
+
+def _format_bytes(nbytes):
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if nbytes < 1024 or unit == 'GB':
+            break
+        nbytes /= 1024
+    if unit == 'B':
+        return str(int(nbytes)) + ' B'
+    return '{:.1f} {}'.format(nbytes, unit)
+
+def _print_report(variables, totals):
+    width = max([len(str(name)) for name in variables] + [len('Total')])
+    columns = ['times', 'data', 'spec_bins', 'cached', 'total', 'shared']
+    print('Name'.ljust(width) + ''.join(title.rjust(11) for title in
+          ['Times', 'Data', 'Spec bins', 'Cached', 'Total', 'Shared']) + '  State')
+    for name, usage in variables.items():
+        print(str(name).ljust(width) +
+              ''.join(_format_bytes(usage[column]).rjust(11) for column in columns) +
+              '  ' + usage['state'])
+    print('Total'.ljust(width) + ' '*44 + _format_bytes(totals['total']).rjust(11) + ' '*13 +
+          _format_bytes(totals['resident']) + ' resident, ' +
+          _format_bytes(totals['mapped']) + ' memory mapped')
@@ -28,18 +28,18 @@ def tplot_names():
     
     index = 0
     return_names=[]
-    for key, _ in data_quants.items():
-        if isinstance(data_quants[key].data, list):
+    for key, tvar in data_quants.items():
+        if tvar.overlay is not None:
             if isinstance(key, str):
                 
-                names_to_print = data_quants[key].name + "  data from: "
-                for name in data_quants[key].data:
+                names_to_print = tvar.name + "  data from: "
+                for name in tvar.overlay:
                     names_to_print = names_to_print + " " + name
                 print(index, ":", names_to_print)
                 index+=1
         else:
             if isinstance(key, str):
-                names_to_print = data_quants[key].name
+                names_to_print = tvar.name
                 print(index, ":", names_to_print)
                 index+=1
         return_names.append(names_to_print)
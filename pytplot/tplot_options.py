@@ -5,6 +5,8 @@
 
 import pytplot
 from . import tplot_utilities
+from .memory_budget import enforce_memory_budget
+from .align_data import enforce_alignment_cache_size
 
 def tplot_options(option, value):
     """
@@ -26,6 +28,10 @@ def tplot_options(option, value):
         title_align   int          Offset position in pixels of the title   
         var_label     srt          Name of the tplot variable to be used as another x axis
         alt_range     [flt, flt]   The min and max altitude to be plotted on all alt plots 
+        memory_budget int          Bytes of memory the tplot variables can use.  Past this, the least recently used are moved to memory mapped files
+        spill_dir     str          Directory for the memory_budget files.  A temporary directory is used by default
+        precision     str          'float32' or 'float64'.  Floating point data stored after this is converted to this type.  By default data keeps its type
+        alignment_cache_size int   Bytes of memory used to keep the results of interpolating tplot variables onto other times, so the tplot_math functions can reuse them.  256 MB by default, 0 keeps nothing
         ============  ==========   =====
     
     Returns:
@@ -39,6 +45,12 @@ def tplot_options(option, value):
         >>> # Set the window size 
         >>> pytplot.tplot_options('wsize', [1000,500])
         
+        >>> # Keep at most 4 GB of data in memory
+        >>> pytplot.tplot_options('memory_budget', 4e9)
+        
+        >>> # Store data in single precision, to use half the memory
+        >>> pytplot.tplot_options('precision', 'float32')
+        
     
     """
     
@@ -49,4 +61,9 @@ def tplot_options(option, value):
     temp = tplot_utilities.set_tplot_options(option, value, pytplot.tplot_opt_glob)
     pytplot.tplot_opt_glob = temp
     
+    if option == 'memory_budget':
+        enforce_memory_budget()
+    if option == 'alignment_cache_size':
+        enforce_alignment_cache_size()
+    
     return
@@ -4,7 +4,6 @@
 # Verify current version before use at: https://github.com/MAVENSDC/PyTplot
 
 import pytplot
-from collections import OrderedDict
 
 def tplot_rename(old_name, new_name):
     """
@@ -34,12 +33,6 @@ def tplot_rename(old_name, new_name):
     if isinstance(old_name, int):
         old_name = pytplot.data_quants[old_name].name
          
-    #remake dictionary with new name in old name's slot
-    d = pytplot.data_quants
-    d2 = OrderedDict([(new_name, v) if k == old_name else (k, v) for k, v in d.items()])
-    data_quants = d2
-    for key in d2:
-        data_quants[key].name = key
-    
-    pytplot.data_quants = data_quants
-    return
\ No newline at end of file
+    #the variable keeps its place in data_quants
+    pytplot.data_quants.rename(old_name, new_name)
+    return
@@ -39,10 +39,9 @@ def tplot_save(names, filename=None):
     
     #Check that we have all available data
     for name in names: 
-        if isinstance(data_quants[name].data, list):
-            for data_name in data_quants[name].data:
-                if data_name not in names:
-                    names.append(data_name)
+        for data_name in data_quants.base_names(name):
+            if data_name not in names:
+                names.append(data_name)
     
     #Pickle it up
     to_pickle =[]
@@ -101,8 +101,44 @@ def set_tplot_options(option, value, old_tplot_opt_glob):
     elif option == 'alt_range':
         new_tplot_opt_glob['alt_range'] = value
     
+    elif option == 'memory_budget':
+        new_tplot_opt_glob['memory_budget'] = value
+    
+    elif option == 'spill_dir':
+        new_tplot_opt_glob['spill_dir'] = value
+    
+    elif option == 'precision':
+        if valid_precision(value):
+            new_tplot_opt_glob['precision'] = value
+    
+    elif option == 'alignment_cache_size':
+        new_tplot_opt_glob['alignment_cache_size'] = value
+    
     return (new_tplot_opt_glob)
 
+def valid_precision(precision):
+    #The precision the data of tplot variables is kept in can be 'float32', 
+    #'float64', or None to keep the type the data was given in
+    if precision in [None, 'float32', 'float64']:
+        return True
+    print("precision must be 'float32', 'float64' or None.")
+    return False
+
+def apply_precision(array, precision):
+    #Converts floating point arrays to the precision's float type.  Integer 
+    #arrays keep their type, so do all arrays if precision is None.
+    if precision is None or array is None or array.dtype.kind != 'f':
+        return array
+    return array.astype(precision, copy=False)
+
+def float_dtype(array):
+    #The float type to use for math on an array that has to be done in floating 
+    #point (like log10).  Float arrays keep their type, anything else uses the 
+    #global precision option, or float64 if it isn't set.
+    if array.dtype.kind == 'f':
+        return array.dtype
+    return np.dtype(pytplot.tplot_opt_glob.get('precision') or np.float64)
+
 def str_to_int(time_str):
     epoch_t = "1970-1-1 00:00:00"
     pattern = "%Y-%m-%d %H:%M:%S"
@@ -191,8 +227,7 @@ def timebar_delete(t, varname=None, dim='height'):
                 list_timebars.remove(i)
             pytplot.data_quants[name].time_bar = list_timebars
     else:
-        if not isinstance(varname, list):
-            varname = [varname]
+        varname = pytplot.data_quants.select(varname)
         for i in varname:
             if i not in pytplot.data_quants.keys():
                 print(str(i) + " is currently not in pytplot.")
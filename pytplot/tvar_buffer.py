@@ -0,0 +1,119 @@
+# Copyright 2018 Regents of the University of Colorado. All Rights Reserved.
+# Released under the MIT license.
+# This software was developed at the University of Colorado's Laboratory for Atmospheric and Space Physics.
+# Verify current version before use at: https://github.com/MAVENSDC/PyTplot
+
+import numpy as np
+
+
+class TVarBuffer(object):
+    """
+    Storage for a TVar that has data appended to it.  The samples are kept in
+    arrays with room to spare at the end, and the times/values/spec_bins of the
+    TVar are views of the filled part.  When the arrays are full their size is
+    doubled, so appending a sample takes constant time on average.
+
+    For ring buffer TVars, the oldest samples are dropped from the front.  The
+    samples are moved back to the start of the arrays when they reach the end,
+    so with a fixed number of samples the memory used stays the same and the
+    data is always one contiguous piece.
+
+    Since the TVar's arrays are views, arrays returned by get_data before an
+    append may no longer match the TVar afterwards.  Copy them if they need to
+    be kept.
+    """
+
+    _MIN_CAPACITY = 16
+
+    def __init__(self, times, values, spec_bins=None, capacity=None):
+        #Index of the first sample in the arrays
+        self.start = 0
+        #Number of samples
+        self.length = len(times)
+        if capacity is None:
+            capacity = 2*self.length
+        capacity = max(capacity, self.length, self._MIN_CAPACITY)
+        self._times = self._allocate(times, capacity)
+        self._values = self._allocate(values, capacity)
+        #Only time varying spec_bins have a row per sample
+        self._spec_bins = None
+        if spec_bins is not None:
+            self._spec_bins = self._allocate(spec_bins, capacity)
+
+    @property
+    def capacity(self):
+        return len(self._times)
+
+    @property
+    def times(self):
+        return self._times[self.start:self.start+self.length]
+
+    @property
+    def values(self):
+        return self._values[self.start:self.start+self.length]
+
+    @property
+    def spec_bins(self):
+        if self._spec_bins is None:
+            return None
+        return self._spec_bins[self.start:self.start+self.length]
+
+    def extend(self, times, values, spec_bins=None):
+        '''
+        Adds samples after the last one.  spec_bins is only used if the
+        buffer was made with time varying spec_bins.
+        '''
+        new_length = self.length + len(times)
+        dtypes_changed = (np.result_type(self._times, times) != self._times.dtype or
+                          np.result_type(self._values, values) != self._values.dtype)
+        if self.start + new_length > self.capacity or dtypes_changed:
+            if new_length <= self.capacity // 2 and not dtypes_changed:
+                self._compact()
+            else:
+                self._resize(max(2*self.capacity, 2*new_length), times, values, spec_bins)
+        end = self.start + self.length
+        self._times[end:end+len(times)] = times
+        self._values[end:end+len(times)] = values
+        if self._spec_bins is not None:
+            self._spec_bins[end:end+len(times)] = spec_bins
+        self.length = new_length
+
+    def drop(self, count):
+        '''
+        Removes the oldest "count" samples.  Nothing is copied, the start of 
+        the samples just moves forward.
+        '''
+        count = min(count, self.length)
+        self.start += count
+        self.length -= count
+        if self.length == 0:
+            self.start = 0
+
+    def _compact(self):
+        #Moves the samples to the front of the arrays, numpy handles the overlap
+        end = self.start + self.length
+        self._times[:self.length] = self._times[self.start:end]
+        self._values[:self.length] = self._values[self.start:end]
+        if self._spec_bins is not None:
+            self._spec_bins[:self.length] = self._spec_bins[self.start:end]
+        self.start = 0
+
+    def _resize(self, capacity, times, values, spec_bins):
+        old_times = self.times
+        old_values = self.values
+        old_spec_bins = self.spec_bins
+        self._times = self._allocate(old_times, capacity, np.result_type(old_times, times))
+        self._values = self._allocate(old_values, capacity, np.result_type(old_values, values))
+        if old_spec_bins is not None:
+            self._spec_bins = self._allocate(old_spec_bins, capacity,
+                                             np.result_type(old_spec_bins, spec_bins))
+        self.start = 0
+
+    @staticmethod
+    def _allocate(array, capacity, dtype=None):
+        #Array with room for "capacity" rows, starting with the rows of "array"
+        if dtype is None:
+            dtype = array.dtype
+        buffer = np.empty((capacity,) + array.shape[1:], dtype=dtype)
+        buffer[:len(array)] = array
+        return buffer
@@ -0,0 +1,319 @@
+# Copyright 2018 Regents of the University of Colorado. All Rights Reserved.
+# Released under the MIT license.
+# This software was developed at the University of Colorado's Laboratory for Atmospheric and Space Physics.
+# Verify current version before use at: https://github.com/MAVENSDC/PyTplot
+
+import bisect
+import fnmatch
+import re
+import threading
+from collections.abc import MutableMapping
+from functools import lru_cache
+from itertools import count
+
+
+class TVarRegistry(MutableMapping):
+    """
+    The dictionary of tplot variables (pytplot.data_quants).  It works like an
+    OrderedDict of names to TVars, and also keeps a sorted index of the names
+    so that wildcard and regular expression lookups don't have to test every
+    name.
+
+    Each name is given a number when it is first stored, which keeps track of
+    the order the variables were created in.
+
+    It also keeps a graph of which variables are combinations of others
+    (their data is a list of names, see store_data).  Each combined variable
+    maps to the base variables it shows, and each base variable maps back to
+    the combined variables that use it.  The graph is updated when variables
+    are stored, deleted or renamed.
+
+    Every change and lookup holds a lock, so variables can be stored from
+    several threads (for example, loaders reading files in parallel) while
+    others read.  values() and items() return lists made while holding the
+    lock, and snapshot() returns a copy of the whole dictionary, so looping
+    over them is not affected by variables being stored or deleted at the
+    same time.
+    """
+
+    def __init__(self):
+        #Name -> number, and number -> name/TVar.  Dictionaries keep the order
+        #things were added, so iterating over the numbers gives creation order.
+        self._numbers = {}
+        self._names = {}
+        self._tvars = {}
+        self._counter = count()
+        #All names in sorted order.  This is rebuilt when needed after deletions.
+        self._sorted_names = []
+        self._sorted_names_current = True
+        #Combined variable name -> list of base variable names, and
+        #base variable name -> set of combined variable names
+        self._bases = {}
+        self._dependents = {}
+        #Reentrant, since deleting a variable looks up the ones that depend on it
+        self._lock = threading.RLock()
+
+    def __getitem__(self, name):
+        with self._lock:
+            return self._tvars[self._numbers[name]]
+
+    def __setitem__(self, name, tvar):
+        with self._lock:
+            self._set(name, tvar)
+
+    def _set(self, name, tvar):
+        self._remove_bases(name)
+        if tvar.overlay is not None:
+            self._add_bases(name, tvar.overlay)
+        if name in self._numbers:
+            #Replacing a variable keeps its place
+            self._tvars[self._numbers[name]] = tvar
+            return
+        number = next(self._counter)
+        self._numbers[name] = number
+        self._names[number] = name
+        self._tvars[number] = tvar
+        if self._sorted_names_current and isinstance(name, str):
+            bisect.insort(self._sorted_names, name)
+
+    def __delitem__(self, name):
+        with self._lock:
+            self._delete(name)
+
+    def _delete(self, name):
+        number = self._numbers.pop(name)
+        self._remove_bases(name)
+        dependents = self._dependents.pop(name, set())
+        del self._names[number]
+        del self._tvars[number]
+        #Taking a name out of the middle of a list is O(n), so the sorted names
+        #are rebuilt in one go the next time they are needed instead
+        self._sorted_names_current = False
+        
+        #Combined variables stop showing a variable that is deleted, whether it 
+        #is one of their bases or a combined variable they include.  One that 
+        #is left with nothing to show is deleted too.  They are updated in the 
+        #order they were made, so combinations of combinations see the 
+        #updated bases of the ones they include.  
+        affected = set(dependents)
+        affected.update(combined for combined in self._bases
+                        if name in self._tvars[self._numbers[combined]].overlay)
+        for combined in sorted(affected, key=self._numbers.__getitem__):
+            if combined not in self._numbers:
+                continue
+            tvar = self[combined]
+            tvar.overlay = [member for member in tvar.overlay if member != name]
+            self._remove_bases(combined)
+            if tvar.overlay:
+                self._add_bases(combined, tvar.overlay)
+            else:
+                self._delete(combined)
+
+    def __contains__(self, name):
+        return name in self._numbers
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._names.values()))
+
+    def __len__(self):
+        return len(self._numbers)
+
+    def rename(self, old_name, new_name):
+        '''
+        Renames a variable in place.  It keeps its place in the order, and the 
+        TVar object stays the same (its "name" is updated).  If a variable 
+        already has the new name, it is replaced.  
+        '''
+        with self._lock:
+            self._rename(old_name, new_name)
+
+    def _rename(self, old_name, new_name):
+        if old_name == new_name:
+            return
+        if new_name in self._numbers:
+            self._delete(new_name)
+        number = self._numbers.pop(old_name)
+        self._numbers[new_name] = number
+        self._names[number] = new_name
+        self._tvars[number].name = new_name
+        self._sorted_names_current = False
+        
+        if old_name in self._bases:
+            bases = self._bases.pop(old_name)
+            self._bases[new_name] = bases
+            for base in bases:
+                self._dependents[base].discard(old_name)
+                self._dependents[base].add(new_name)
+        if old_name in self._dependents:
+            dependents = self._dependents.pop(old_name)
+            self._dependents[new_name] = dependents
+            for dependent in dependents:
+                self._bases[dependent] = _replace(self._bases[dependent], old_name, new_name)
+                tvar = self[dependent]
+                tvar.overlay = _replace(tvar.overlay, old_name, new_name)
+
+    def number(self, name):
+        '''
+        Returns the number a variable was given when it was first stored, or 
+        None if it isn't stored.  Storing it again or renaming it keeps the 
+        number, a variable stored after it was deleted gets a new one.  
+        '''
+        with self._lock:
+            return self._numbers.get(name)
+
+    def name_of(self, number):
+        '''Returns the name of the variable with a number, or None if it was deleted'''
+        with self._lock:
+            return self._names.get(number)
+
+    def clear(self):
+        with self._lock:
+            self._numbers.clear()
+            self._names.clear()
+            self._tvars.clear()
+            self._sorted_names = []
+            self._sorted_names_current = True
+            self._bases.clear()
+            self._dependents.clear()
+
+    def snapshot(self):
+        '''
+        Returns a copy of the registry as a dictionary of names to TVars, in
+        the order they were created.  Changes made to the registry afterwards
+        (by this thread or others) don't affect it.
+        '''
+        with self._lock:
+            return {self._names[number]: tvar for number, tvar in self._tvars.items()}
+
+    def values(self):
+        return list(self.snapshot().values())
+
+    def items(self):
+        return list(self.snapshot().items())
+
+    def __repr__(self):
+        return 'TVarRegistry(' + repr(list(self)) + ')'
+
+    def match(self, pattern, regex=False):
+        '''
+        Returns the names that match a pattern, in the order they were created.
+
+        Parameters:
+            pattern : str
+                A wildcard pattern, where "*" matches anything and "?" matches
+                one character.  If regex is True, a regular expression that has
+                to match the start of the name (like re.match).
+            regex : bool, optional
+                Whether the pattern is a regular expression.
+        '''
+        if regex:
+            compiled = _compile_regex(pattern)
+            prefix = _regex_prefix(pattern)
+        else:
+            if not is_wildcard(pattern):
+                return [pattern] if pattern in self._numbers else []
+            compiled = _compile_wildcard(pattern)
+            prefix = _wildcard_prefix(pattern)
+        with self._lock:
+            #Only the names that start with the fixed beginning of the pattern
+            #need to be tested
+            names = self._sorted()
+            first = bisect.bisect_left(names, prefix)
+            last = bisect.bisect_left(names, prefix + '\U0010ffff') if prefix else len(names)
+            matches = [name for name in names[first:last] if compiled.match(name)]
+            matches.sort(key=self._numbers.__getitem__)
+        return matches
+
+    def select(self, names):
+        '''
+        Turns a name, a wildcard pattern, or a list of them into a list of names.
+        Names that are not stored are left in the list, so the caller can
+        report them.
+        '''
+        if not isinstance(names, list):
+            names = [names]
+        selected = []
+        for name in names:
+            if isinstance(name, str) and is_wildcard(name):
+                selected.extend(self.match(name))
+            else:
+                selected.append(name)
+        return selected
+
+    def base_names(self, name):
+        '''
+        Returns the names of the variables that hold the data shown by a 
+        variable.  For a combination of variables, these are the variables it 
+        combines (and the variables they combine, and so on).  For any other 
+        variable, it is just its own name.  
+        '''
+        with self._lock:
+            if name in self._bases:
+                return list(self._bases[name])
+        return [name]
+
+    def base_tvars(self, name):
+        '''Returns the TVars of base_names(name)'''
+        with self._lock:
+            return [self[base] for base in self.base_names(name)]
+
+    def dependents(self, name):
+        '''Returns the names of the combined variables that show a variable'''
+        with self._lock:
+            return sorted(self._dependents.get(name, ()), key=self._numbers.__getitem__)
+
+    def _add_bases(self, name, overlay):
+        bases = []
+        for member in overlay:
+            for base in self._bases.get(member, [member]):
+                if base not in bases:
+                    bases.append(base)
+        self._bases[name] = bases
+        for base in bases:
+            self._dependents.setdefault(base, set()).add(name)
+
+    def _remove_bases(self, name):
+        for base in self._bases.pop(name, []):
+            dependents = self._dependents.get(base)
+            if dependents is not None:
+                dependents.discard(name)
+                if not dependents:
+                    del self._dependents[base]
+
+    def _sorted(self):
+        if not self._sorted_names_current:
+            self._sorted_names = sorted(name for name in self._numbers if isinstance(name, str))
+            self._sorted_names_current = True
+        return self._sorted_names
+
+
+def is_wildcard(name):
+    '''Returns True if the name has the wildcard characters "*" or "?" in it'''
+    return isinstance(name, str) and ('*' in name or '?' in name)
+
+@lru_cache(maxsize=256)
+def _compile_wildcard(pattern):
+    return re.compile(fnmatch.translate(pattern))
+
+@lru_cache(maxsize=256)
+def _compile_regex(pattern):
+    return re.compile(pattern)
+
+def _wildcard_prefix(pattern):
+    #The part of the pattern before the first special character
+    return re.split(r'[*?\[]', pattern, maxsplit=1)[0]
+
+def _regex_prefix(pattern):
+    #The literal characters at the start of a regular expression.  Anything
+    #followed by a quantifier might not be there, so it is not included.
+    if '|' in pattern:
+        return ''
+    match = re.match(r'[A-Za-z0-9_\-]*', pattern)
+    prefix = match.group(0)
+    if len(prefix) < len(pattern) and pattern[len(prefix)] in '*?{':
+        prefix = prefix[:-1]
+    return prefix
+
+def _replace(names, old_name, new_name):
+    return [new_name if name == old_name else name for name in names]
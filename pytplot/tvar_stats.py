@@ -0,0 +1,85 @@
+# Copyright 2018 Regents of the University of Colorado. All Rights Reserved.
+# Released under the MIT license.
+# This software was developed at the University of Colorado's Laboratory for Atmospheric and Space Physics.
+# Verify current version before use at: https://github.com/MAVENSDC/PyTplot
+
+import numpy as np
+
+
+class TVarStats(object):
+    """
+    Summary statistics of the values of a TVar, computed once when the data is stored.
+    Plot ranges and log scale checks read from here instead of rescanning the data.
+    NaN and infinite values are ignored.  Any statistic that has no values to come
+    from is NaN.
+    """
+
+    def __init__(self, values=None):
+        #Number of finite values
+        self.finite_count = 0
+        self._min = np.inf
+        self._max = -np.inf
+        self._min_positive = np.inf
+        if values is not None:
+            self.update(values)
+
+    @property
+    def min(self):
+        '''Smallest finite value'''
+        return self._min if self.finite_count else np.nan
+
+    @property
+    def max(self):
+        '''Largest finite value'''
+        return self._max if self.finite_count else np.nan
+
+    @property
+    def min_positive(self):
+        '''Smallest finite value greater than 0, which is the lower limit of a log scale'''
+        return self._min_positive if np.isfinite(self._min_positive) else np.nan
+
+    def update(self, values):
+        '''
+        Folds new values into the statistics.  This is also used when data is
+        appended to a TVar, so that only the new values need to be scanned.
+        '''
+        values = np.asarray(values)
+        if values.size == 0 or values.dtype.kind not in 'biuf':
+            return
+        if values.dtype.kind == 'f':
+            finite = np.isfinite(values)
+            finite_count = int(np.count_nonzero(finite))
+            if finite_count == 0:
+                return
+            new_min = np.min(values, where=finite, initial=np.inf)
+            new_max = np.max(values, where=finite, initial=-np.inf)
+            new_min_positive = np.min(values, where=finite & (values > 0), initial=np.inf)
+        else:
+            #Integers are always finite
+            finite_count = values.size
+            new_min = values.min()
+            new_max = values.max()
+            if new_max > 0:
+                new_min_positive = np.min(values, where=values > 0, initial=new_max)
+            else:
+                new_min_positive = np.inf
+        self._min = min(self._min, new_min)
+        self._max = max(self._max, new_max)
+        self._min_positive = min(self._min_positive, new_min_positive)
+        self.finite_count += finite_count
+
+    def remove(self, values):
+        '''
+        Takes values that were dropped from a TVar out of the statistics.  
+        Returns False if the dropped values may have included the min, max or 
+        min_positive, in which case the statistics have to be recomputed.  
+        '''
+        dropped = TVarStats(values)
+        if dropped.finite_count == 0:
+            return True
+        if dropped.min <= self._min or dropped.max >= self._max:
+            return False
+        if dropped._min_positive <= self._min_positive:
+            return False
+        self.finite_count -= dropped.finite_count
+        return True
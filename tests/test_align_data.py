@@ -0,0 +1,13 @@
+import numpy as np
+from pytplot.align_data import interpolate_values
+
+
+def test_spline_workers_match_one_process():
+    times = np.arange(200.)
+    values = np.random.rand(200, 5).astype(np.float32)
+    new_times = times[:-1] + 0.5
+    for method in ['cubic', 'quad_spline', 'linear']:
+        serial = interpolate_values(times, values, new_times, method=method)
+        parallel = interpolate_values(times, values, new_times, method=method, workers=2)
+        assert parallel.dtype == np.float32
+        assert np.array_equal(serial, parallel)
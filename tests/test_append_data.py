@@ -0,0 +1,27 @@
+import numpy as np
+import pytplot
+
+
+def test_append_integers_keeps_float32():
+    pytplot.store_data('appended32', data={'x':[1, 2, 3], 'y':[[1., 2.], [3., 4.], [5., 6.]]},
+                       precision='float32')
+    pytplot.append_data('appended32', [4, 5], [[7, 8], [9, 10]])
+    values = pytplot.data_quants['appended32'].values
+    assert values.dtype == np.float32
+    assert np.array_equal(values[-1], [9, 10])
+
+
+def test_append_different_bins_to_collapsed_bins():
+    #Time varying bins that are the same at every time are stored as one row
+    pytplot.store_data('appended_bins', data={'x':[1, 2], 'y':[[1., 2.], [3., 4.]],
+                                              'v':[[10., 20.], [10., 20.]]})
+    assert not pytplot.data_quants['appended_bins'].spec_bins_time_varying
+    pytplot.append_data('appended_bins', 3, [5., 6.], v=[10., 20.])
+    assert pytplot.data_quants['appended_bins'].spec_bins.shape == (1, 2)
+    pytplot.append_data('appended_bins', 4, [7., 8.], v=[30., 40.])
+    tvar = pytplot.data_quants['appended_bins']
+    assert tvar.spec_bins_time_varying
+    assert np.array_equal(tvar.spec_bins, [[10, 20], [10, 20], [10, 20], [30, 40]])
+    pytplot.append_data('appended_bins', 5, [9., 10.], v=[[50., 60.]])
+    assert np.array_equal(tvar.spec_bins[-1], [50, 60])
+    assert len(tvar.spec_bins) == len(tvar.times) == 5
@@ -0,0 +1,21 @@
+import numpy as np
+from pytplot.bin_data import bin_values, bin_methods
+
+
+def test_nan_times_are_left_out():
+    times = np.array([0., 1., 2., np.nan])
+    values = np.array([1., 2., 3., 100.])
+    for method in bin_methods:
+        bin_times, binned = bin_values(times, values, 2, method=method)
+        expected_times, expected = bin_values(times[:3], values[:3], 2, method=method)
+        assert np.array_equal(bin_times, expected_times)
+        assert np.array_equal(binned, expected, equal_nan=True)
+    bin_times, binned = bin_values(times, values, 2)
+    assert np.array_equal(bin_times, [0., 2.])
+    assert np.allclose(binned[:, 0], [1.5, 3.])
+
+
+def test_only_nan_times():
+    bin_times, binned = bin_values(np.array([np.nan, np.nan]), np.ones((2, 3)), 1)
+    assert len(bin_times) == 0
+    assert binned.shape == (0, 3)
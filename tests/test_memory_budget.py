@@ -0,0 +1,45 @@
+import numpy as np
+import pytplot
+from pytplot.memory_budget import resident_bytes, spill_tvar, array_owner
+
+
+def test_views_are_counted_once():
+    x = np.arange(1000.)
+    y = np.random.rand(1000, 4)
+    pytplot.store_data('budget_whole', data={'x':x, 'y':y}, copy=False)
+    pytplot.store_data('budget_half', data={'x':x[:500], 'y':y[:500]}, copy=False)
+    tvars = [pytplot.data_quants['budget_whole'], pytplot.data_quants['budget_half']]
+    assert resident_bytes(tvars) == x.nbytes + y.nbytes
+    assert resident_bytes(tvars[1:]) == x.nbytes + y.nbytes
+
+
+def test_spilled_views_share_the_spilled_owner():
+    x = np.arange(1000.)
+    y = np.random.rand(1000, 4)
+    pytplot.store_data('spill_whole', data={'x':x, 'y':y}, copy=False)
+    pytplot.store_data('spill_half', data={'x':x[:500], 'y':y[:500]}, copy=False)
+    spilled = {}
+    released = spill_tvar(pytplot.data_quants['spill_half'], spilled)
+    released |= spill_tvar(pytplot.data_quants['spill_whole'], spilled)
+    assert released == {id(x), id(y)}
+    whole = pytplot.data_quants['spill_whole']
+    half = pytplot.data_quants['spill_half']
+    assert isinstance(array_owner(half.values), np.memmap)
+    assert array_owner(half.values) is array_owner(whole.values)
+    assert np.array_equal(half.values, y[:500])
+    assert np.array_equal(whole.times, x)
+    tvars = [whole, half]
+    assert resident_bytes(tvars) == 0
+
+
+def test_budget_spills_until_it_fits():
+    pytplot.data_quants.clear()
+    for i in range(4):
+        pytplot.store_data('budget' + str(i), data={'x':np.arange(10000.), 'y':np.random.rand(10000, 3)})
+    pytplot.tplot_options('memory_budget', 2*320000)
+    try:
+        assert resident_bytes(list(pytplot.data_quants.values())) <= 2*320000
+        assert isinstance(array_owner(pytplot.data_quants['budget0'].values), np.memmap)
+        assert not isinstance(array_owner(pytplot.data_quants['budget3'].values), np.memmap)
+    finally:
+        pytplot.tplot_options('memory_budget', None)
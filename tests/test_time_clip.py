@@ -0,0 +1,9 @@
+import numpy as np
+import pytplot
+
+
+def test_numpy_scalar_times():
+    pytplot.store_data('clip', data={'x':np.arange(10.), 'y':np.arange(10.)})
+    for min_time, max_time in [(np.int64(2), np.int64(4)), (np.float32(2), np.float64(4))]:
+        time_val, data_val = pytplot.time_clip('clip', min_time, max_time)
+        assert np.array_equal(time_val, [2., 3., 4.])
@@ -0,0 +1,125 @@
+import gc
+import weakref
+import numpy as np
+import pytest
+import pytplot
+import pytplot.tplot_math as tplot_math
+
+
+def _store(name, y, x=None):
+    if x is None:
+        x = np.arange(10.)
+    pytplot.store_data(name, data={'x':x, 'y':y})
+
+
+def test_recipe_cycle_is_not_kept():
+    t = np.arange(10.)
+    _store('cycle_x', t)
+    _store('cycle_c', t)
+    tplot_math.add_data('cycle_x', 'cycle_c', 'cycle_y')
+    tplot_math.sub_data('cycle_y', 'cycle_c', 'cycle_x')
+    assert pytplot.data_quants['cycle_x'].recipe is None
+    assert np.allclose(pytplot.data_quants['cycle_x'].values[:, 0], t)
+
+
+def test_recipe_dropped_when_input_renamed():
+    t = np.arange(10.)
+    _store('renamed', t)
+    tplot_math.mult_data('renamed', 'renamed', 'renamed_squared')
+    pytplot.tplot_rename('renamed', 'renamed2')
+    _store('renamed', np.zeros(10))
+    assert np.allclose(pytplot.data_quants['renamed_squared'].values[:, 0], t**2)
+    assert pytplot.data_quants['renamed_squared'].recipe is None
+
+
+def test_recipe_recomputes_when_input_stored_again():
+    t = np.arange(10.)
+    _store('restored', t)
+    tplot_math.mult_data('restored', 'restored', 'restored_squared')
+    _store('restored', 2*t)
+    assert np.allclose(pytplot.data_quants['restored_squared'].values[:, 0], 4*t**2)
+
+
+def test_replaced_or_deleted_input_is_freed():
+    t = np.arange(10.)
+    _store('freed', t)
+    tplot_math.add_data_across('freed', 'freed_sum')
+    old = weakref.ref(pytplot.data_quants['freed'])
+    _store('freed', 2*t)
+    gc.collect()
+    assert old() is None
+    assert np.allclose(pytplot.data_quants['freed_sum'].values[:, 0], 2*t)
+    old = weakref.ref(pytplot.data_quants['freed'])
+    pytplot.del_data('freed')
+    gc.collect()
+    assert old() is None
+    assert np.allclose(pytplot.data_quants['freed_sum'].values[:, 0], 2*t)
+
+
+def test_deriv_data_of_decreasing_unsigned_data():
+    y = np.array([10, 8, 6, 4, 2], dtype=np.uint16)
+    _store('deriv_uint', y, x=np.arange(5.))
+    for method in ['forward', 'central', 'gradient']:
+        tplot_math.deriv_data('deriv_uint', 'deriv_uint_' + method, method=method)
+        assert np.allclose(pytplot.data_quants['deriv_uint_' + method].values, -2)
+
+
+def test_deriv_data_needs_two_samples():
+    _store('deriv_one', np.array([1.]), x=np.array([0.]))
+    for method in ['forward', 'central', 'gradient']:
+        with pytest.raises(ValueError):
+            tplot_math.deriv_data('deriv_one', 'deriv_one_' + method, method=method)
+        assert 'deriv_one_' + method not in pytplot.data_quants
+
+
+def test_evaluate_follows_inputs_to_new_time_range():
+    t = np.arange(10.)
+    _store('eval_a', t)
+    _store('eval_b', t)
+    tplot_math.evaluate('eval_product', 'eval_a * eval_b')
+    _store('eval_a', t, x=t+100)
+    _store('eval_b', t, x=t+100.5)
+    times, values = pytplot.get_data('eval_product')
+    assert times[0] == 101 and times[-1] == 109
+    assert np.allclose(values[:, 0], t[1:]*(t[1:]-0.5))
+
+
+def test_evaluate_unsigned_data_does_not_wrap():
+    _store('eval_a', np.array([1, 2, 3], dtype=np.uint16), x=np.arange(3.))
+    _store('eval_b', np.array([3, 4, 5], dtype=np.uint16), x=np.arange(3.))
+    tplot_math.evaluate('eval_a_minus_b', 'eval_a - eval_b + 0.5*2')
+    assert np.allclose(pytplot.data_quants['eval_a_minus_b'].values, -1)
+
+
+def test_evaluate_rejects_unknown_method():
+    _store('eval_c', np.arange(10.))
+    assert tplot_math.evaluate('eval_bad', 'eval_c * 2', interp='bogus') is None
+    assert 'eval_bad' not in pytplot.data_quants
+
+
+def test_two_variable_math_rejects_unknown_method():
+    _store('interp_a', np.arange(10.))
+    for function in [tplot_math.add_data, tplot_math.sub_data, tplot_math.mult_data, tplot_math.div_data]:
+        assert function('interp_a', 'interp_a', 'interp_bad', interp='bogus') is None
+        assert 'interp_bad' not in pytplot.data_quants
+
+
+def test_avg_res_data_rejects_bad_arguments():
+    _store('binned', np.arange(10.))
+    assert tplot_math.avg_res_data('binned', 0, 'binned_bad') is None
+    assert tplot_math.avg_res_data('binned', -5, 'binned_bad') is None
+    assert tplot_math.avg_res_data('binned', 5, 'binned_bad', method='mode') is None
+    assert 'binned_bad' not in pytplot.data_quants
+    tplot_math.avg_res_data('binned', 5, 'binned_5')
+    assert np.allclose(pytplot.data_quants['binned_5'].values[:, 0], [2, 7])
+
+
+def test_flatten_data_reversed_window_is_nan():
+    _store('flattened', np.arange(1., 11.))
+    tplot_math.flatten_data('flattened', 7, 2, 'flattened_reversed')
+    assert np.all(np.isnan(pytplot.data_quants['flattened_reversed'].values))
+    tvar = pytplot.data_quants['flattened']
+    assert np.all(np.isnan(tvar.window_mean(7, 2)))
+    assert np.allclose(tvar.window_mean([2, 7], [4, 2]), [[4], [np.nan]], equal_nan=True)
+    tplot_math.flatten_data('flattened', 2, 4, 'flattened_forward')
+    assert np.allclose(pytplot.data_quants['flattened_forward'].values[:, 0], np.arange(1., 11.)/4)
@@ -0,0 +1,21 @@
+import numpy as np
+import pytplot
+
+
+def test_sort_times_reorders_nd_data():
+    times = np.array([1., 2., 3.])
+    dist = np.arange(24.).reshape(3, 2, 4)
+    energy = np.array([[10., 20.], [11., 21.], [12., 22.]])
+    pytplot.store_data('sorted_nd', data={'x':times, 'y':dist, 'v1':energy, 'v2':[1., 2., 3., 4.]})
+    tvar = pytplot.data_quants['sorted_nd']
+    #Times set directly aren't sorted until they are used
+    order = np.array([2, 0, 1])
+    tvar.times = times[order]
+    tvar.values = tvar.values[order]
+    tvar.nd_values = tvar.nd_values[order]
+    tvar.nd_axes = [tvar.nd_axes[0][order], tvar.nd_axes[1]]
+    tvar.sort_times()
+    assert np.array_equal(tvar.times, times)
+    assert np.array_equal(tvar.nd_values, dist)
+    assert np.array_equal(tvar.nd_axes[0], energy)
+    assert np.array_equal(tvar.nd_axes[1], [1., 2., 3., 4.])
@@ -0,0 +1,47 @@
+import pickle
+import numpy as np
+import pandas as pd
+import pytplot
+from pytplot import TVar
+
+
+def _baseline_pickle(state):
+    #A pickle of a TVar as the DataFrame based TVar wrote them: the class, 
+    #then the attributes it had in its __dict__
+    class Old(object):
+        def __reduce__(self):
+            return (object.__new__, (TVar,), state)
+    return pickle.dumps(Old(), protocol=4)
+
+
+def _baseline_state(data, spec_bins=None):
+    return {'name':'old', 'number':0, 'data':data, 'spec_bins':spec_bins,
+            'yaxis_opt':{'axis_label':'old', 'y_range':[0, 1]}, 'zaxis_opt':{},
+            'line_opt':{}, 'trange':[1, 3], 'dtype':'', 'create_time':'',
+            'time_bar':[], 'extras':{'panel_size':1}, 'links':{},
+            'spec_bins_time_varying':False, 'spec_bins_ascending':True}
+
+
+def test_load_baseline_pickle():
+    df = pd.DataFrame([[1., 2.], [3., 4.], [5., 6.]], index=[1, 2, 3])
+    bins = pd.DataFrame([[10., 20.]])
+    tvar = pickle.loads(_baseline_pickle(_baseline_state(df, bins)))
+    assert np.array_equal(tvar.times, [1, 2, 3])
+    assert np.array_equal(tvar.values, [[1., 2.], [3., 4.], [5., 6.]])
+    assert np.array_equal(tvar.spec_bins, [[10., 20.]])
+    assert tvar.overlay is None
+    assert tvar.recipe is None
+    assert tvar.trange == [1, 3]
+
+
+def test_load_baseline_pickle_of_combined_variable():
+    tvar = pickle.loads(_baseline_pickle(_baseline_state(['a', 'b'])))
+    assert tvar.overlay == ['a', 'b']
+    assert tvar.values is None
+
+
+def test_pickle_round_trip():
+    pytplot.store_data('pickled', data={'x':[1, 2, 3], 'y':[[1, 2], [3, 4], [5, 6]], 'v':[7, 8]})
+    tvar = pickle.loads(pickle.dumps(pytplot.data_quants['pickled']))
+    assert np.array_equal(tvar.values, pytplot.data_quants['pickled'].values)
+    assert np.array_equal(tvar.spec_bins, [[7, 8]])
@@ -0,0 +1,31 @@
+import numpy as np
+import pytplot
+
+
+def _store(name):
+    pytplot.store_data(name, data={'x':np.arange(5.), 'y':np.arange(5.)})
+
+
+def test_deleting_last_base_deletes_combination():
+    _store('reg_a')
+    _store('reg_b')
+    pytplot.store_data('reg_ab', data=['reg_a', 'reg_b'])
+    pytplot.del_data('reg_a')
+    assert pytplot.data_quants['reg_ab'].overlay == ['reg_b']
+    assert pytplot.data_quants.base_names('reg_ab') == ['reg_b']
+    pytplot.del_data('reg_b')
+    assert 'reg_ab' not in pytplot.data_quants
+    assert 'reg_ab' not in pytplot.data_quants.dependents('reg_b')
+
+
+def test_deleting_nested_combination():
+    _store('nest_a')
+    _store('nest_b')
+    pytplot.store_data('nest_inner', data=['nest_a'])
+    pytplot.store_data('nest_outer', data=['nest_inner', 'nest_b'])
+    pytplot.del_data('nest_a')
+    assert 'nest_inner' not in pytplot.data_quants
+    assert pytplot.data_quants['nest_outer'].overlay == ['nest_b']
+    assert pytplot.data_quants.base_tvars('nest_outer')[0].name == 'nest_b'
+    pytplot.del_data('nest_*')
+    assert not pytplot.data_quants.match('nest_*')